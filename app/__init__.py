@@ -2,10 +2,20 @@
 __all__ = [
     "calculator_repl",
     "calculation",
+    "calculator_checkpoint",
     "calculator_config",
     "calculator_memento",
+    "dataset",
+    "distributed",
     "exceptions",
     "history",
+    "history_codec",
+    "history_columns",
+    "history_export",
+    "history_shm",
+    "history_verify",
     "input_validators",
+    "memory",
     "operations",
+    "precision",
 ]
\ No newline at end of file
@@ -1,20 +1,63 @@
 from __future__ import annotations
 
+import sys
+import threading
+
 from .calculator_config import CalculatorConfig
-from .calculator_repl import Calculator, LoggingObserver, run_repl
+from .calculator_repl import Calculator, LoggingObserver, run_dataset_command, run_repl
+from .distributed import Worker
 from .history import History
+from .history_shm import SharedHistoryPublisher, serve_history_file
 
 
 def main() -> None:  # pragma: no cover
+    # Worker mode: python -m app worker [host] [port]
+    if sys.argv[1:2] == ["worker"]:
+        host = sys.argv[2] if len(sys.argv) > 2 else "127.0.0.1"
+        port = int(sys.argv[3]) if len(sys.argv) > 3 else 8765
+        worker = Worker(host, port)
+        print(f"Worker listening on {worker.address[0]}:{worker.address[1]}")
+        worker.serve_forever()
+        return
+
     cfg = CalculatorConfig.load()
-    calc = Calculator(config=cfg, history=History())
+
+    # Publisher daemon: python -m app publish [name]
+    # serves CALC_HISTORY_FILE in shared memory and follows its appends
+    if sys.argv[1:2] == ["publish"]:
+        name = sys.argv[2] if len(sys.argv) > 2 else (cfg.shared_history or "calc_history")
+        publisher = SharedHistoryPublisher(name)
+        print(f"Publishing {cfg.history_file} as shared history {name!r} (Ctrl+C to stop)")
+        try:
+            serve_history_file(cfg.history_file, publisher, threading.Event())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            publisher.close()
+        return
+
+    calc = Calculator(config=cfg, history=History(memory_budget=cfg.history_memory_budget))
     calc.add_observer(LoggingObserver(print))
 
-    # Try loading existing history (EAFP)
+    # CLI dataset mode: python -m app dataset div data.csv out.csv x y
+    if sys.argv[1:2] == ["dataset"]:
+        print(run_dataset_command(calc, sys.argv[1:]))
+        return
+
+    # Prefer resuming the last session image unless the history file was
+    # saved after it (crash after autosave); fall back to the history (EAFP)
     try:
-        calc.load()
+        calc.resume(require_current=True)
     except Exception:
-        pass
+        try:
+            calc.load()
+        except Exception:
+            pass
+    if cfg.shared_history:
+        try:
+            calc.attach_shared(cfg.shared_history)
+        except Exception as e:
+            print(f"Shared history unavailable: {e}")
 
     def input_fn() -> str:
         return input("> ")
@@ -22,7 +65,11 @@ def main() -> None:  # pragma: no cover
     def output_fn(s: str) -> None:
         print(s)
 
-    run_repl(calc, input_fn, output_fn)
+    try:
+        run_repl(calc, input_fn, output_fn)
+    finally:
+        # automatic checkpoint on exit so the next start resumes instantly
+        calc.checkpoint()
 
 
 if __name__ == "__main__":  # pragma: no cover
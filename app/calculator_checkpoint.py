@@ -0,0 +1,175 @@
+# app/calculator_checkpoint.py
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .calculator_memento import CalculatorMemento
+from .exceptions import CheckpointError
+
+# File layout:
+#   MAGIC | header (payload_len, n_buffers) | buffer table (offset, length)*
+#   | pickle payload | out-of-band buffers (64-byte aligned)
+#
+# DataFrames are pickled column by column (_PackedFrame): history columns are
+# object dtype, whose cells pickle in-band one by one, so all-float/all-int
+# columns are stored as float64/int64 arrays and string columns as integer
+# codes plus their distinct values. The arrays travel as out-of-band buffers;
+# columns holding anything else (big ints, Decimals, mixed types) stay objects.
+MAGIC = b"CALCCKP3"
+_HEADER = struct.Struct("<QI")
+_ENTRY = struct.Struct("<QQ")
+_ALIGN = 64
+_NATIVE = {"floating": np.float64, "integer": np.int64}
+
+
+@dataclass(frozen=True)
+class CheckpointState:
+    """
+    Full calculator session: current history plus undo/redo snapshots.
+    chunks holds the data of every spilled history chunk the snapshots
+    reference, keyed by the SpillChunk path it was read from.
+    """
+    history: CalculatorMemento
+    undo: List[CalculatorMemento]
+    redo: List[CalculatorMemento]
+    chunks: Dict[str, pd.DataFrame]
+
+
+@dataclass(frozen=True)
+class _PackedFrame:
+    index: pd.Index
+    # name -> ("array", values) | ("codes", codes, uniques) | ("object", values)
+    columns: Dict[str, Tuple]
+
+    @classmethod
+    def pack(cls, df: pd.DataFrame) -> "_PackedFrame":
+        return cls(index=df.index, columns={name: _pack_column(df[name]) for name in df.columns})
+
+    def unpack(self) -> pd.DataFrame:
+        data = {}
+        for name, packed in self.columns.items():
+            values = packed[2].take(packed[1]).array if packed[0] == "codes" else packed[1]
+            # explicit dtype: pandas would otherwise re-infer object strings;
+            # copy=False keeps the numeric columns on the mapped buffers
+            data[name] = pd.Series(values, index=self.index, dtype=values.dtype, copy=False)
+        return pd.DataFrame(data, columns=list(self.columns), copy=False)
+
+
+def _pack_column(col: pd.Series) -> Tuple:
+    if isinstance(col.dtype, np.dtype) and col.dtype != object:
+        return ("array", col.to_numpy())
+    if col.dtype == object:
+        values = col.to_numpy()
+        kind = pd.api.types.infer_dtype(values, skipna=False)
+        if kind in _NATIVE:
+            try:
+                return ("array", values.astype(_NATIVE[kind]))
+            except OverflowError:
+                pass  # ints past int64 stay exact as objects
+        if kind != "string":
+            return ("object", values)
+    # strings (object or str dtype): codes out-of-band, distinct values in-band
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    return ("codes", codes, uniques)
+
+
+def _pack_memento(m: CalculatorMemento) -> Tuple[Optional[_PackedFrame], tuple, int]:
+    frame = None if m.is_prefix else _PackedFrame.pack(m.history_df)
+    return frame, m.spilled, m.rows
+
+
+def _unpack_memento(packed: Tuple[Optional[_PackedFrame], tuple, int]) -> CalculatorMemento:
+    frame, spilled, rows = packed
+    return CalculatorMemento(history_df=None if frame is None else frame.unpack(), spilled=spilled, rows=rows)
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_checkpoint(path: str, state: CheckpointState) -> None:
+    """
+    Serialize a session as one binary image.
+    Numeric column data goes out-of-band (pickle protocol 5) so that
+    read_checkpoint can map it straight back without copying.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    payload = pickle.dumps(
+        {
+            "history": _pack_memento(state.history),
+            "undo": [_pack_memento(m) for m in state.undo],
+            "redo": [_pack_memento(m) for m in state.redo],
+            "chunks": {key: _PackedFrame.pack(df) for key, df in state.chunks.items()},
+        },
+        protocol=5,
+        buffer_callback=buffers.append,
+    )
+    raws = [b.raw() for b in buffers]
+
+    table_end = len(MAGIC) + _HEADER.size + _ENTRY.size * len(raws)
+    offset = _aligned(table_end + len(payload))
+    entries = []
+    for raw in raws:
+        entries.append((offset, raw.nbytes))
+        offset = _aligned(offset + raw.nbytes)
+
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(len(payload), len(raws)))
+            for entry in entries:
+                f.write(_ENTRY.pack(*entry))
+            f.write(payload)
+            for (off, _), raw in zip(entries, raws):
+                f.write(b"\0" * (off - f.tell()))
+                f.write(raw)
+        # atomic replace: a crash mid-write never clobbers the last good image
+        os.replace(tmp, path)
+    except Exception as e:  # noqa: BLE001
+        raise CheckpointError(f"Failed to write checkpoint to {path}: {e}") from e
+
+
+def read_checkpoint(path: str) -> CheckpointState:
+    """
+    Memory-map a checkpoint image and rebuild the session state from it.
+    Numeric columns of the returned frames are read-only views on the
+    mapping. The image is unpickled, so only read checkpoints you wrote:
+    CALC_CHECKPOINT_FILE is trusted input.
+    """
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise CheckpointError(f"Not a calculator checkpoint: {path}")
+
+        pos = len(MAGIC)
+        payload_len, n_buffers = _HEADER.unpack_from(view, pos)
+        pos += _HEADER.size
+        buffers = []
+        for _ in range(n_buffers):
+            off, length = _ENTRY.unpack_from(view, pos)
+            pos += _ENTRY.size
+            buffers.append(view[off : off + length])
+
+        # out-of-band buffers stay backed by the mapping (zero-copy)
+        data = pickle.loads(view[pos : pos + payload_len], buffers=buffers)
+        return CheckpointState(
+            history=_unpack_memento(data["history"]),
+            undo=[_unpack_memento(m) for m in data["undo"]],
+            redo=[_unpack_memento(m) for m in data["redo"]],
+            chunks={key: packed.unpack() for key, packed in data["chunks"].items()},
+        )
+    except CheckpointError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise CheckpointError(f"Failed to read checkpoint from {path}: {e}") from e
@@ -8,10 +8,27 @@ from dotenv import load_dotenv
 from .exceptions import ConfigError
 
 
+def _non_negative_int(env: str, default: int, unit: str = "byte count") -> int:
+    raw = os.getenv(env, str(default)).strip()
+    try:
+        value = int(raw)
+    except ValueError as e:
+        raise ConfigError(f"{env} must be an integer {unit}.") from e
+    if value < 0:
+        raise ConfigError(f"{env} cannot be negative.")
+    return value
+
+
 @dataclass(frozen=True)
 class CalculatorConfig:
     history_file: str
     autosave: bool
+    checkpoint_file: str = "calc_session.ckpt"
+    history_memory_budget: int = 0
+    precision: int = 0
+    undo_memory_budget: int = 0
+    memory_warn_bytes: int = 0
+    shared_history: str = ""
 
     @staticmethod
     def load() -> "CalculatorConfig":
@@ -20,6 +37,13 @@ class CalculatorConfig:
         Expected:
           - CALC_HISTORY_FILE (default: calc_history.csv)
           - CALC_AUTOSAVE (default: true)
+          - CALC_CHECKPOINT_FILE (default: calc_session.ckpt)
+          - CALC_HISTORY_MEMORY_BUDGET (bytes, default: 0 = keep all history in RAM)
+          - CALC_PRECISION (Decimal digits for exact escalation, default: 0 = floats only)
+          - CALC_UNDO_MEMORY_BUDGET (bytes for undo/redo snapshots; the oldest undo
+            entries are evicted past it, default: 0 = unlimited)
+          - CALC_MEMORY_WARN_BYTES (warn when accounted memory exceeds it, default: 0 = off)
+          - CALC_SHARED_HISTORY (shared-memory history name to publish/attach, default: off)
         """
         load_dotenv()
 
@@ -32,4 +56,25 @@ class CalculatorConfig:
             raise ConfigError("CALC_AUTOSAVE must be a boolean-like value.")
 
         autosave = autosave_raw in {"true", "1", "yes"}
-        return CalculatorConfig(history_file=history_file, autosave=autosave)
\ No newline at end of file
+
+        checkpoint_file = os.getenv("CALC_CHECKPOINT_FILE", "calc_session.ckpt").strip()
+        if not checkpoint_file:
+            raise ConfigError("CALC_CHECKPOINT_FILE cannot be empty.")
+
+        history_memory_budget = _non_negative_int("CALC_HISTORY_MEMORY_BUDGET", 0)
+        precision = _non_negative_int("CALC_PRECISION", 0, unit="digit count")
+        undo_memory_budget = _non_negative_int("CALC_UNDO_MEMORY_BUDGET", 0)
+        memory_warn_bytes = _non_negative_int("CALC_MEMORY_WARN_BYTES", 0)
+
+        shared_history = os.getenv("CALC_SHARED_HISTORY", "").strip()
+
+        return CalculatorConfig(
+            history_file=history_file,
+            autosave=autosave,
+            checkpoint_file=checkpoint_file,
+            history_memory_budget=history_memory_budget,
+            precision=precision,
+            undo_memory_budget=undo_memory_budget,
+            memory_warn_bytes=memory_warn_bytes,
+            shared_history=shared_history,
+        )
\ No newline at end of file
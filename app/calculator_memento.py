@@ -2,13 +2,39 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Tuple
+
 import pandas as pd
 
+from .history import SpillChunk
+
 
 @dataclass(frozen=True)
 class CalculatorMemento:
-    """Memento Pattern: snapshot of calculator state (history dataframe)."""
-    history_df: pd.DataFrame
+    """
+    Memento Pattern: snapshot of calculator state (history dataframe).
+    With a memory-budgeted History, history_df is only the in-memory window
+    and spilled lists the shared, immutable on-disk chunks before it.
+
+    A snapshot taken right before rows are appended holds no data: with
+    history_df None it stands for the first `rows` rows of the history it
+    is restored onto (History.truncate).
+    """
+    history_df: Optional[pd.DataFrame] = None
+    spilled: Tuple[SpillChunk, ...] = ()
+    rows: int = 0
+
+    @property
+    def is_prefix(self) -> bool:
+        return self.history_df is None
 
     def copy_df(self) -> pd.DataFrame:
-        return self.history_df.copy()
\ No newline at end of file
+        return self.history_df.copy()
+
+    @cached_property
+    def nbytes(self) -> int:
+        """Resident size of the snapshot (memory_usage(deep=True)); computed once."""
+        if self.history_df is None:
+            return 0
+        return int(self.history_df.memory_usage(deep=True).sum())
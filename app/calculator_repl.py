@@ -1,16 +1,30 @@
 # app/calculator_repl.py
 from __future__ import annotations
 
+import os
+import tracemalloc
+import warnings
 from dataclasses import dataclass
-from typing import Callable, List, Protocol
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Protocol
+
+import numpy as np
+import pandas as pd
 
 from .calculation import Calculation
+from .calculator_checkpoint import CheckpointState, read_checkpoint, write_checkpoint
 from .calculator_config import CalculatorConfig
 from .calculator_memento import CalculatorMemento
-from .exceptions import InvalidInputError
+from .dataset import DatasetSummary, apply_to_columns
+from .exceptions import CheckpointError, InvalidInputError
 from .history import History
-from .input_validators import is_command, normalize_command, parse_two_floats
-from .operations import OperationFactory
+from .history_export import ExportSummary, export_history
+from .history_shm import SharedHistoryReader
+from .history_verify import TolerancePolicy, VerifyReport, verify_file, verify_history
+from .input_validators import is_command, normalize_command, parse_operand, split_operands
+from .memory import MemoryBudgetWarning, MemoryReport, measure, mementos_bytes
+from .operations import BatchResult, Operand, OperationFactory, execute_batch
+from .precision import AdaptiveEngine
 
 
 class Observer(Protocol):
@@ -43,6 +57,8 @@ class Calculator:
       - history persistence (pandas)
       - observers (Observer)
       - undo/redo (Memento)
+      - adaptive precision (float fast path, Decimal escalation) when
+        config.precision > 0
     """
     config: CalculatorConfig
     history: History
@@ -51,6 +67,11 @@ class Calculator:
         self._observers: List[Observer] = []
         self._undo_stack: List[CalculatorMemento] = []
         self._redo_stack: List[CalculatorMemento] = []
+        self.undo_evictions = 0
+        self.shared: Optional[SharedHistoryReader] = None
+        self.engine: Optional[AdaptiveEngine] = (
+            AdaptiveEngine(self.config.precision) if self.config.precision else None
+        )
 
     def add_observer(self, obs: Observer) -> None:
         self._observers.append(obs)
@@ -60,14 +81,65 @@ class Calculator:
             obs.on_calculation(calc)
 
     def _snapshot(self) -> CalculatorMemento:
-        return CalculatorMemento(history_df=self.history.df)
+        # History replaces its window and chunks instead of modifying them,
+        # so snapshots share both by reference
+        return CalculatorMemento(history_df=self.history._df, spilled=self.history.spilled)
+
+    def _record_undo(self, append: bool = False) -> None:
+        """
+        Push the state before a change. Before an append the row count is
+        enough: this entry is only restored once everything recorded after
+        it has been undone, i.e. onto the same history plus the new rows.
+        """
+        if append:
+            self._undo_stack.append(CalculatorMemento(rows=len(self.history)))
+        else:
+            self._undo_stack.append(self._snapshot())
+        self._redo_stack.clear()
+        self._enforce_memory_budgets()
+
+    def _restore(self, m: CalculatorMemento) -> None:
+        if m.is_prefix:
+            self.history.truncate(m.rows)
+        else:
+            self.history.restore(m.history_df, m.spilled)
+
+    def _enforce_memory_budgets(self) -> None:
+        """
+        Run whenever an undo step is recorded: evict the oldest undo snapshots
+        while undo + redo exceed config.undo_memory_budget, then warn if the
+        history window plus snapshots are past config.memory_warn_bytes.
+        Only running totals are used here (History.window_bytes, cached
+        memento sizes); memory_report() is too slow for every calculation.
+        """
+        budget, warn_at = self.config.undo_memory_budget, self.config.memory_warn_bytes
+        if not (budget or warn_at):
+            return
+        used = mementos_bytes(self._undo_stack) + mementos_bytes(self._redo_stack)
+        while budget and self._undo_stack and used > budget:
+            used -= self._undo_stack.pop(0).nbytes
+            self.undo_evictions += 1
+        if warn_at:
+            total = self.history.window_bytes + used
+            if total > warn_at:
+                warnings.warn(
+                    f"calculator memory {total} bytes exceeds CALC_MEMORY_WARN_BYTES="
+                    f"{self.config.memory_warn_bytes}",
+                    MemoryBudgetWarning,
+                    stacklevel=3,
+                )
+
+    def memory_report(self) -> MemoryReport:
+        """Bytes per subsystem (history, undo, redo, observers), plus tracemalloc when tracing."""
+        return measure(self.history, self._undo_stack, self._redo_stack, self._observers)
 
     def calculate(self, op_token: str, a: float, b: float) -> Calculation:
         # take snapshot before change for undo
-        self._undo_stack.append(self._snapshot())
-        self._redo_stack.clear()
+        self._record_undo(append=True)
 
         strategy = OperationFactory.create(op_token)
+        if self.engine is not None:
+            strategy = self.engine.wrap(strategy)
         calc = Calculation.from_strategy(a, b, strategy)
         self.history.add(calc)
 
@@ -77,45 +149,176 @@ class Calculator:
         self._notify(calc)
         return calc
 
+    def calculate_many(self, op_token: str, a: Operand, b: Operand) -> BatchResult:
+        """
+        Broadcast one operation over array operands. Successful elements are
+        appended to history in one bulk write; failed ones are only reported.
+        Observers get one summary calculation: operation "batch:<op>",
+        a=elements, b=errors, result=successful elements.
+        """
+        strategy = OperationFactory.create(op_token)
+        batch = execute_batch(strategy, a, b)
+
+        ok = batch.ok
+        ts = datetime.now(timezone.utc).isoformat()
+        if ok.any():
+            self._record_undo(append=True)
+            self.history.add_many(ts, batch.a[ok], batch.b[ok], strategy.name, batch.result[ok])
+            if self.config.autosave:
+                self.save()
+
+        n_ok = int(ok.sum())
+        self._notify(
+            Calculation(
+                a=float(ok.size),
+                b=float(ok.size - n_ok),
+                operation=f"batch:{strategy.name}",
+                result=float(n_ok),
+                timestamp_utc=ts,
+            )
+        )
+        return batch
+
+    def run_dataset(
+        self,
+        op_tokens: List[str],
+        input_path: str,
+        output_path: str,
+        sources: List[str],
+        record: bool = False,
+    ) -> DatasetSummary:
+        """
+        Dataset mode: stream input_path through an operation chain (see
+        app.dataset). With record=True one summary row is added to history:
+        operation "dataset:<chain>", a=rows, b=errors, result=successful rows.
+        """
+        summary = apply_to_columns(input_path, output_path, op_tokens, sources)
+        if record:
+            self._record_undo(append=True)
+            ts = datetime.now(timezone.utc).isoformat()
+            self.history.add_many(
+                ts,
+                [summary.rows],
+                [summary.errors],
+                f"dataset:{summary.chain}",
+                [summary.rows - summary.errors],
+            )
+            if self.config.autosave:
+                self.save()
+        return summary
+
     def undo(self) -> bool:
         if not self._undo_stack:
             return False
         self._redo_stack.append(self._snapshot())
-        m = self._undo_stack.pop()
-        self.history._df = m.copy_df()  # internal restore
+        self._restore(self._undo_stack.pop())
         return True
 
     def redo(self) -> bool:
         if not self._redo_stack:
             return False
         self._undo_stack.append(self._snapshot())
-        m = self._redo_stack.pop()
-        self.history._df = m.copy_df()  # internal restore
+        self._enforce_memory_budgets()
+        self._restore(self._redo_stack.pop())
         return True
 
     def clear(self) -> None:
-        self._undo_stack.append(self._snapshot())
-        self._redo_stack.clear()
+        self._record_undo()
         self.history.clear()
         if self.config.autosave:
             self.save()
 
     def save(self) -> None:
-        self.history.to_csv(self.config.history_file)
+        self.history.save(self.config.history_file)
 
     def load(self) -> None:
-        self._undo_stack.append(self._snapshot())
-        self._redo_stack.clear()
-        self.history.from_csv(self.config.history_file)
+        self._record_undo()
+        self.history.load(self.config.history_file)
+
+    def checkpoint(self) -> None:
+        """Write the whole session (history + undo/redo) as a binary image."""
+        current = CalculatorMemento(history_df=self.history._df, spilled=self.history.spilled)
+        mementos = [current, *self._undo_stack, *self._redo_stack]
+        chunks = {
+            c.path: pd.read_pickle(c.path) for m in mementos for c in m.spilled
+        }
+        state = CheckpointState(
+            history=current,
+            undo=list(self._undo_stack),
+            redo=list(self._redo_stack),
+            chunks=chunks,
+        )
+        write_checkpoint(self.config.checkpoint_file, state)
+
+    def resume(self, require_current: bool = False) -> None:
+        """
+        Restore a session written by checkpoint(), replacing current state.
+        With require_current=True a checkpoint older than the history file
+        (e.g. left by a crash after later autosaves) is refused with
+        CheckpointError instead of rolling the history back.
+        """
+        if require_current and self._checkpoint_is_stale():
+            raise CheckpointError(
+                f"Checkpoint {self.config.checkpoint_file} is older than {self.config.history_file}."
+            )
+        state = read_checkpoint(self.config.checkpoint_file)
+        # spilled chunks are re-homed in this history's spill directory
+        adopted = self.history.adopt_chunks(state.chunks)
+
+        def relink(m: CalculatorMemento) -> CalculatorMemento:
+            return CalculatorMemento(
+                history_df=m.history_df, spilled=tuple(adopted[c.path] for c in m.spilled), rows=m.rows
+            )
+
+        current = relink(state.history)
+        self.history.restore(current.history_df, current.spilled)
+        self._undo_stack = [relink(m) for m in state.undo]
+        self._redo_stack = [relink(m) for m in state.redo]
+
+    def _checkpoint_is_stale(self) -> bool:
+        # a missing file is not "stale": read_checkpoint reports it
+        try:
+            checkpoint = os.stat(self.config.checkpoint_file).st_mtime_ns
+            return checkpoint < os.stat(self.config.history_file).st_mtime_ns
+        except OSError:
+            return False
+
+    def export(
+        self, path: str, fmt: Optional[str] = None, compression: Optional[str] = None
+    ) -> ExportSummary:
+        """Stream history to JSON Lines/CSV/Arrow IPC (see app.history_export)."""
+        return export_history(self.history, path, fmt, compression)
+
+    def verify(self, path: Optional[str] = None, policy: Optional[TolerancePolicy] = None) -> VerifyReport:
+        """Recompute stored results (current history, or a saved file) and report mismatches."""
+        if path is None:
+            return verify_history(self.history, policy)
+        return verify_file(path, policy)
+
+    def attach_shared(self, name: str) -> SharedHistoryReader:
+        """Show a history published in shared memory (see app.history_shm) instead of our own."""
+        reader = SharedHistoryReader(name)
+        self.detach_shared()
+        self.shared = reader
+        return reader
+
+    def detach_shared(self) -> None:
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
 
     def format_history(self) -> str:
-        df = self.history.df
-        if df.empty:
+        source = self.history
+        if self.shared is not None:
+            self.shared.refresh()
+            source = self.shared
+        if not len(source):
             return "(history is empty)"
         # keep it simple and deterministic for tests
         lines = []
-        for _, r in df.iterrows():
-            lines.append(f"{r['operation']} {r['a']} {r['b']} = {r['result']}")
+        for df in source.iter_chunks():
+            for _, r in df.iterrows():
+                lines.append(f"{r['operation']} {r['a']} {r['b']} = {r['result']}")
         return "\n".join(lines)
 
 
@@ -127,16 +330,53 @@ HELP_TEXT = """Commands:
   redo       Redo last undone change
   save       Save history to CSV
   load       Load history from CSV
+  checkpoint Save the full session (history + undo/redo)
+  resume     Restore the session saved by checkpoint
+  precision  Show adaptive precision escalation statistics
+  memory [trace on|off]
+             Show bytes held by history, undo/redo snapshots and observers;
+             trace on/off toggles tracemalloc allocation tracking
+  export <path> [jsonl|csv|arrow] [none|gzip|bz2|xz]
+             Stream history to a file (format/compression default from suffix)
+  dataset <op>[,<op>...] <in.csv> <out.csv> <col|num> <col|num> [...]
+             Stream a CSV, apply the operation chain column-wise, write results
+  verify [<path>] [<rel_tol> [<abs_tol>]]
+             Recompute every stored result (history, or a saved file) and
+             report rows that differ beyond the tolerance (default 1e-9, 0)
+  shared [<name>|off]
+             Attach to / detach from a history published in shared memory
+             (python -m app publish); while attached, history shows it
   exit       Exit the program
 
 Operations:
   add/+   sub/-   mul/*   div/    pow/^   root
 Usage:
   <op> <a> <b>
+  a and b may also be vectors [1,2,3] or range(start, stop[, step])
 Example:
   add 2 3
+  mul [1,2,3,4] 2.5
 """
 
+MAX_REPORTED_ERRORS = 5
+
+
+def format_batch(batch: BatchResult) -> str:
+    """Summarize a batch result instead of printing every element."""
+    ok = batch.ok
+    n_ok = int(ok.sum())
+    lines = [f"{batch.result.size} elements, {n_ok} ok, {len(batch.errors)} errors"]
+    if n_ok:
+        vals = batch.result[ok]
+        lines.append(
+            f"min={vals.min()} max={vals.max()} mean={vals.mean()} sum={vals.sum()}"
+        )
+    for i, msg in list(batch.errors.items())[:MAX_REPORTED_ERRORS]:
+        lines.append(f"  [{i}] {batch.a[i]}, {batch.b[i]}: {msg}")
+    if len(batch.errors) > MAX_REPORTED_ERRORS:
+        lines.append(f"  ... {len(batch.errors) - MAX_REPORTED_ERRORS} more errors")
+    return "\n".join(lines)
+
 
 def process_line(calc: Calculator, line: str) -> str:
     """
@@ -166,19 +406,126 @@ def process_line(calc: Calculator, line: str) -> str:
         if low == "load":
             calc.load()
             return "Loaded."
+        if low == "checkpoint":
+            calc.checkpoint()
+            return "Checkpointed."
+        if low == "resume":
+            calc.resume()
+            return "Resumed."
+        if low == "precision":
+            if calc.engine is None:
+                return "Adaptive precision is off (set CALC_PRECISION)."
+            return calc.engine.stats.summary()
         if low == "exit": # pragma: no cover
             return "EXIT"
+    head = low.split(maxsplit=1)[0]
+    if head == "dataset":
+        return _process_dataset(calc, s.split()[1:])
+    if head == "export":
+        return _process_export(calc, s.split()[1:])
+    if head == "verify":
+        return _process_verify(calc, s.split()[1:])
+    if head == "memory":
+        return _process_memory(calc, low.split()[1:])
+    if head == "shared":
+        return _process_shared(calc, s.split()[1:])
+
     # operation line
-    parts = s.split()
-    if len(parts) < 3:
+    parts = s.split(maxsplit=1)
+    operands = split_operands(parts[1]) if len(parts) > 1 else []
+    if len(operands) < 2:
         raise InvalidInputError("Expected: <op> <a> <b>")
 
     op = parts[0]
-    a, b = parse_two_floats(parts[1:3])
+    a, b = (parse_operand(t) for t in operands[:2])
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return format_batch(calc.calculate_many(op, a, b))
     c = calc.calculate(op, a, b)
     return f"{c.result}"
 
 
+def run_dataset_command(calc: Calculator, args: List[str]) -> str:
+    """
+    CLI dataset mode (python -m app dataset ...): args are taken as given,
+    so paths may contain spaces, and nothing is recorded in history, so the
+    history file is left alone.
+    """
+    return _process_dataset(calc, args[1:], record=False)
+
+
+def _process_dataset(calc: Calculator, args: List[str], record: bool = True) -> str:
+    if len(args) < 5:
+        raise InvalidInputError(
+            "Expected: dataset <op>[,<op>...] <in.csv> <out.csv> <col|num> <col|num> [...]"
+        )
+    ops = [t for t in args[0].split(",") if t]
+    summary = calc.run_dataset(ops, args[1], args[2], args[3:], record=record)
+    return (
+        f"{summary.chain}: {summary.rows} rows in {summary.chunks} chunks, "
+        f"{summary.errors} errors -> {args[2]}"
+    )
+
+
+def _process_export(calc: Calculator, args: List[str]) -> str:
+    if not 1 <= len(args) <= 3:
+        raise InvalidInputError("Expected: export <path> [jsonl|csv|arrow] [none|gzip|bz2|xz]")
+    fmt = args[1] if len(args) > 1 else None
+    compression = args[2] if len(args) > 2 else None
+    summary = calc.export(args[0], fmt, compression)
+    return f"Exported {summary.rows} rows as {summary.fmt} ({summary.compression}) -> {args[0]}"
+
+
+def _process_verify(calc: Calculator, args: List[str]) -> str:
+    path = None
+    if args:
+        try:
+            float(args[0])
+        except ValueError:
+            path, args = args[0], args[1:]
+    if len(args) > 2:
+        raise InvalidInputError("Expected: verify [<path>] [<rel_tol> [<abs_tol>]]")
+    try:
+        tolerances = [float(t) for t in args]
+    except ValueError as e:
+        raise InvalidInputError(f"Invalid tolerance: {e}") from e
+    return calc.verify(path, TolerancePolicy(*tolerances)).summary()
+
+
+def _process_memory(calc: Calculator, args: List[str]) -> str:
+    if args == ["trace", "on"]:
+        tracemalloc.start()
+        return "Tracing allocations."
+    if args == ["trace", "off"]:
+        tracemalloc.stop()
+        return "Tracing stopped."
+    if args:
+        raise InvalidInputError("Expected: memory [trace on|off]")
+    report = calc.memory_report()
+    text = report.summary()
+    if calc.undo_evictions:
+        text += f"\n  {calc.undo_evictions} undo entries evicted (CALC_UNDO_MEMORY_BUDGET)"
+    return text
+
+
+def _process_shared(calc: Calculator, args: List[str]) -> str:
+    if len(args) > 1:
+        raise InvalidInputError("Expected: shared [<name>|off]")
+    if args == ["off"]:
+        calc.detach_shared()
+        return "Detached."
+    if args:
+        reader = calc.attach_shared(args[0])
+        return f"Attached to {reader.name}: {len(reader)} rows (generation {reader.generation})."
+    if calc.shared is None:
+        return "Not attached (shared <name>)."
+    before = len(calc.shared)
+    calc.shared.refresh()
+    return (
+        f"{calc.shared.name}: {len(calc.shared)} rows (generation {calc.shared.generation}, "
+        f"{len(calc.shared) - before:+d} since last refresh)"
+    )
+
+
 def run_repl(
     calc: Calculator,
     input_fn: Callable[[], str],
@@ -0,0 +1,119 @@
+# app/dataset.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import DatasetError, InvalidInputError
+from .operations import OperationFactory, OperationStrategy
+
+DEFAULT_CHUNKSIZE = 100_000
+
+Source = Union[str, float]
+
+
+@dataclass(frozen=True)
+class DatasetSummary:
+    rows: int
+    errors: int
+    chunks: int
+    chain: str
+
+
+@dataclass(frozen=True)
+class CompiledChain:
+    """
+    A left fold of strategies over column sources:
+      ((s0 op1 s1) op2 s2) ...
+    Each source is either a column name or a numeric constant.
+    """
+    ops: List[OperationStrategy]
+    sources: List[Source]
+
+    @property
+    def columns(self) -> List[str]:
+        # unique column names, in first-use order
+        return list(dict.fromkeys(s for s in self.sources if isinstance(s, str)))
+
+    @property
+    def name(self) -> str:
+        return ",".join(op.name for op in self.ops)
+
+    def evaluate(self, chunk: pd.DataFrame) -> np.ndarray:
+        cols = {c: pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float) for c in self.columns}
+
+        def value(src: Source) -> Union[float, np.ndarray]:
+            return cols[src] if isinstance(src, str) else src
+
+        acc = value(self.sources[0])
+        with np.errstate(all="ignore"):
+            for op, src in zip(self.ops, self.sources[1:]):
+                acc = op.execute_array(acc, value(src))
+        return np.broadcast_to(np.asarray(acc, dtype=float), (len(chunk),))
+
+
+def compile_chain(op_tokens: Sequence[str], sources: Sequence[str], header: Sequence[str]) -> CompiledChain:
+    """
+    Resolve operation tokens through OperationFactory and each source against
+    the file header; a source that is not a column must parse as a number.
+    """
+    if not op_tokens:
+        raise InvalidInputError("Dataset mode needs at least one operation.")
+    if len(sources) != len(op_tokens) + 1:
+        raise InvalidInputError(
+            f"{len(op_tokens)} operation(s) need {len(op_tokens) + 1} column/constant operands."
+        )
+    ops = [OperationFactory.create(t) for t in op_tokens]
+    resolved: List[Source] = []
+    for s in sources:
+        if s in header:
+            resolved.append(s)
+            continue
+        try:
+            resolved.append(float(s))
+        except ValueError as e:
+            raise InvalidInputError(f"Unknown column: {s}") from e
+    if not any(isinstance(s, str) for s in resolved):
+        raise InvalidInputError("Dataset mode needs at least one column operand.")
+    return CompiledChain(ops=ops, sources=resolved)
+
+
+def apply_to_columns(
+    input_path: str,
+    output_path: str,
+    op_tokens: Sequence[str],
+    sources: Sequence[str],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    output_column: str = "result",
+) -> DatasetSummary:
+    """
+    Stream a CSV in chunks of `chunksize` rows, evaluate the compiled chain on
+    the chosen columns with vectorized kernels, and write one result column to
+    output_path. Only the referenced columns of one chunk are ever in memory.
+    Rows whose result is not finite (bad input, division by zero, ...) are
+    written as empty cells and counted as errors.
+    """
+    try:
+        header = list(pd.read_csv(input_path, nrows=0).columns)
+    except Exception as e:  # noqa: BLE001
+        raise DatasetError(f"Failed to read dataset {input_path}: {e}") from e
+    chain = compile_chain(op_tokens, sources, header)
+
+    rows = errors = chunks = 0
+    try:
+        reader = pd.read_csv(input_path, usecols=chain.columns, chunksize=chunksize)
+        with open(output_path, "w", newline="") as out:
+            pd.DataFrame(columns=[output_column]).to_csv(out, index=False)
+            for chunk in reader:
+                result = chain.evaluate(chunk)
+                result = np.where(np.isfinite(result), result, np.nan)
+                pd.DataFrame({output_column: result}).to_csv(out, index=False, header=False)
+                rows += len(result)
+                errors += int(np.isnan(result).sum())
+                chunks += 1
+    except Exception as e:  # noqa: BLE001
+        raise DatasetError(f"Dataset run failed ({input_path} -> {output_path}): {e}") from e
+    return DatasetSummary(rows=rows, errors=errors, chunks=chunks, chain=chain.name)
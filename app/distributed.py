@@ -0,0 +1,282 @@
+# app/distributed.py
+from __future__ import annotations
+
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .exceptions import DistributedError
+from .operations import Operand, OperationFactory, execute_batch
+
+Address = Tuple[str, int]
+
+# Wire protocol: one JSON object per line, in both directions.
+#   request:  {"id": <chunk>, "op": "div", "a": [...], "b": [...]}
+#   response: {"id": <chunk>, "result": [...], "errors": {"<i>": "<msg>"}}
+#          or {"id": <chunk>, "error": "<msg>"}
+# NaN/inf travel as JSON's non-standard NaN/Infinity literals (both ends are Python).
+
+
+def _send(stream, msg: dict) -> None:
+    stream.write(json.dumps(msg).encode() + b"\n")
+    stream.flush()
+
+
+def _recv(stream) -> dict:
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    return json.loads(line)
+
+
+def _parse_result(reply: dict, size: int) -> Tuple[np.ndarray, Dict[int, str]]:
+    """Validate a worker's result reply; ValueError if it is malformed."""
+    try:
+        values = np.asarray(reply["result"], dtype=float)
+        errors = {int(i): str(e) for i, e in reply["errors"].items()}
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise ValueError(f"malformed reply: {e!r}") from e
+    if values.shape != (size,) or any(not 0 <= i < size for i in errors):
+        raise ValueError(f"malformed reply: expected {size} results")
+    return values, errors
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            msg = json.loads(line)
+            try:
+                strategy = OperationFactory.create(msg["op"])
+                batch = execute_batch(strategy, np.asarray(msg["a"]), np.asarray(msg["b"]))
+                reply = {
+                    "id": msg["id"],
+                    "result": batch.result.tolist(),
+                    "errors": {str(i): e for i, e in batch.errors.items()},
+                }
+            except Exception as e:  # noqa: BLE001
+                reply = {"id": msg.get("id"), "error": str(e)}
+            _send(self.wfile, reply)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Worker:
+    """
+    Evaluation worker: serves chunks with the OperationFactory/execute_batch
+    engine. Run one per process with `python -m app worker [host] [port]`,
+    or start() it on a background thread (tests, single-host setups).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = _Server((host, port), _WorkerHandler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def serve_forever(self) -> None:  # pragma: no cover - blocking entry point
+        self._server.serve_forever()
+
+    def start(self) -> "Worker":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@dataclass
+class WorkerStats:
+    address: Address
+    chunks: int = 0
+    elements: int = 0
+    busy_seconds: float = 0.0
+    stolen: int = 0
+    failed: bool = False
+
+    @property
+    def throughput(self) -> float:
+        """Elements per second of time spent waiting on this worker."""
+        return self.elements / self.busy_seconds if self.busy_seconds else 0.0
+
+
+@dataclass
+class DistributedResult:
+    result: np.ndarray
+    errors: Dict[int, str]
+    stats: List[WorkerStats] = field(default_factory=list)
+
+
+@dataclass
+class _Chunk:
+    id: int
+    start: int
+    stop: int
+    attempts: int = 0
+
+
+class Coordinator:
+    """
+    Splits one broadcast operation into chunks and farms them out to workers.
+
+    Each worker starts with a contiguous share of the chunks in its own deque
+    and takes work from the front; an idle worker steals from the back of the
+    busiest remaining deque. A chunk in flight on a worker that disconnects or
+    times out goes back to the front of that worker's deque (where the others
+    will steal it) until it has been tried max_attempts times. Results are
+    written into place by chunk offset, so the output is always in order.
+    """
+
+    def __init__(
+        self,
+        workers: List[Address],
+        chunk_size: int = 10_000,
+        timeout: float = 30.0,
+        max_attempts: int = 3,
+    ) -> None:
+        if not workers:
+            raise DistributedError("Coordinator needs at least one worker.")
+        if chunk_size < 1:
+            raise DistributedError("chunk_size must be positive.")
+        self.workers = list(workers)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+    def run(self, op_token: str, a: Operand, b: Operand) -> DistributedResult:
+        strategy = OperationFactory.create(op_token)
+        a_arr, b_arr = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(a, dtype=float)),
+            np.atleast_1d(np.asarray(b, dtype=float)),
+        )
+        n = a_arr.size
+        chunks = [
+            _Chunk(id=i, start=s, stop=min(s + self.chunk_size, n))
+            for i, s in enumerate(range(0, n, self.chunk_size))
+        ]
+
+        # contiguous initial shares keep neighbouring chunks on one worker
+        share = -(-len(chunks) // len(self.workers)) if chunks else 0
+        queues: List[Deque[_Chunk]] = [
+            deque(chunks[i * share : (i + 1) * share]) for i in range(len(self.workers))
+        ]
+        stats = [WorkerStats(address=w) for w in self.workers]
+        result = np.empty(n, dtype=float)
+        errors: Dict[int, str] = {}
+        state = {"remaining": len(chunks), "in_flight": 0, "fatal": None}
+        cond = threading.Condition()
+
+        def next_chunk(idx: int) -> Optional[_Chunk]:
+            with cond:
+                while True:
+                    if state["fatal"] is not None or state["remaining"] == 0:
+                        return None
+                    if queues[idx]:
+                        chunk = queues[idx].popleft()
+                    else:
+                        victim = max(range(len(queues)), key=lambda j: len(queues[j]))
+                        if not queues[victim]:
+                            # every unfinished chunk is in flight elsewhere and
+                            # may still come back if that worker is lost
+                            cond.wait()
+                            continue
+                        stats[idx].stolen += 1
+                        chunk = queues[victim].pop()
+                    state["in_flight"] += 1
+                    return chunk
+
+        def fail(msg: str) -> None:
+            with cond:
+                state["fatal"] = state["fatal"] or msg
+                cond.notify_all()
+
+        def drive(idx: int) -> None:
+            chunk = None
+            try:
+                with socket.create_connection(self.workers[idx], timeout=self.timeout) as sock:
+                    stream = sock.makefile("rwb")
+                    while True:
+                        chunk = next_chunk(idx)
+                        if chunk is None:
+                            return
+                        chunk.attempts += 1
+                        t0 = time.perf_counter()
+                        _send(stream, {
+                            "id": chunk.id,
+                            "op": strategy.name,
+                            "a": a_arr[chunk.start : chunk.stop].tolist(),
+                            "b": b_arr[chunk.start : chunk.stop].tolist(),
+                        })
+                        reply = _recv(stream)
+                        if "error" in reply:
+                            fail(f"worker {self.workers[idx]} rejected chunk {chunk.id}: {reply['error']}")
+                            return
+                        values, chunk_errors = _parse_result(reply, chunk.stop - chunk.start)
+                        with cond:
+                            result[chunk.start : chunk.stop] = values
+                            for i, e in chunk_errors.items():
+                                errors[chunk.start + i] = e
+                            state["remaining"] -= 1
+                            state["in_flight"] -= 1
+                            st = stats[idx]
+                            st.chunks += 1
+                            st.elements += chunk.stop - chunk.start
+                            st.busy_seconds += time.perf_counter() - t0
+                            cond.notify_all()
+                        chunk = None
+            except Exception:  # noqa: BLE001
+                # lost or misbehaving worker (anything escaping here would leave
+                # the other threads waiting on its chunk): hand it back
+                with cond:
+                    stats[idx].failed = True
+                    if chunk is not None:
+                        state["in_flight"] -= 1
+                        if chunk.attempts >= self.max_attempts:
+                            state["fatal"] = state["fatal"] or (
+                                f"chunk {chunk.id} failed after {chunk.attempts} attempts"
+                            )
+                        else:
+                            queues[idx].appendleft(chunk)
+                    cond.notify_all()
+
+        threads = [threading.Thread(target=drive, args=(i,)) for i in range(len(self.workers))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if state["fatal"] is not None:
+            raise DistributedError(state["fatal"])
+        if state["remaining"]:
+            raise DistributedError(f"All workers failed with {state['remaining']} chunks left.")
+
+        errors = dict(sorted(errors.items()))
+        return DistributedResult(result=result, errors=errors, stats=stats)
+
+
+def format_stats(stats: List[WorkerStats]) -> str:
+    """Per-worker throughput report."""
+    lines = []
+    for s in stats:
+        host, port = s.address
+        status = "FAILED" if s.failed else "ok"
+        lines.append(
+            f"{host}:{port} {status} chunks={s.chunks} stolen={s.stolen} "
+            f"elements={s.elements} throughput={s.throughput:.0f}/s"
+        )
+    return "\n".join(lines)
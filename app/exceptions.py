@@ -21,4 +21,17 @@ class ConfigError(CalculatorError):
 
 
 class HistoryError(CalculatorError):
-    """Raised when history save/load fails."""
\ No newline at end of file
+    """Raised when history save/load fails."""
+
+
+class CheckpointError(CalculatorError):
+    """Raised when a session checkpoint cannot be written or resumed."""
+
+
+
+class DatasetError(CalculatorError):
+    """Raised when a dataset (column-wise file) run fails."""
+
+
+class DistributedError(CalculatorError):
+    """Raised when distributed evaluation cannot complete."""
\ No newline at end of file
@@ -1,28 +1,132 @@
 # app/history.py
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
+import weakref
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
 import pandas as pd
 
 from .exceptions import HistoryError
 from .calculation import Calculation
+from .history_codec import is_history_binary, iter_history_binary, write_history_binary
+
+CSV_CHUNKSIZE = 100_000
+BINARY_SUFFIX = ".chb"
+
+
+@dataclass(frozen=True)
+class SpillChunk:
+    """An immutable block of older history rows written to disk."""
+    path: str
+    rows: int
 
 
 class History:
     """
     pandas-based history store.
     Columns: timestamp_utc, a, b, operation, result
+
+    With a memory_budget (bytes, 0 = unlimited) only a hot tail of rows stays
+    in RAM; once the in-memory window outgrows the budget its older half is
+    spilled to an on-disk chunk. iter_chunks(), format/query helpers and
+    to_csv walk spilled chunks then the window, one chunk at a time.
+    Spilled chunks are never modified, so undo snapshots can share them;
+    the window is likewise replaced, never modified in place.
     """
     COLUMNS = ["timestamp_utc", "a", "b", "operation", "result"]
 
-    def __init__(self) -> None:
+    def __init__(self, memory_budget: int = 0, spill_dir: Optional[str] = None) -> None:
         self._df = pd.DataFrame(columns=self.COLUMNS)
+        self._spilled: Tuple[SpillChunk, ...] = ()
+        self.memory_budget = memory_budget
+        self._spill_dir = spill_dir
+        self._chunk_ids = count()
+        # (window it was measured on, its deep size), see window_bytes
+        self._window_size: Tuple[Optional[weakref.ref], int] = (None, 0)
 
     @property
     def df(self) -> pd.DataFrame:
-        return self._df.copy()
+        """The full history as one DataFrame (materializes spilled chunks)."""
+        if not self._spilled:
+            return self._df.copy()
+        return pd.concat(list(self.iter_chunks()), ignore_index=True)
+
+    @property
+    def spilled(self) -> Tuple[SpillChunk, ...]:
+        return self._spilled
+
+    def __len__(self) -> int:
+        return sum(c.rows for c in self._spilled) + len(self._df)
+
+    @property
+    def window_bytes(self) -> int:
+        """
+        memory_usage(deep=True) of the in-memory window. Appends add the size
+        of the new rows to a running total; any other change re-measures
+        once, on the next call.
+        """
+        ref, size = self._window_size
+        if ref is None or ref() is not self._df:
+            size = int(self._df.memory_usage(deep=True).sum())
+            self._window_size = (weakref.ref(self._df), size)
+        return size
+
+    def _append(self, rows: pd.DataFrame) -> None:
+        old = self._df
+        self._df = pd.concat([old, rows], ignore_index=True)
+        ref, before = self._window_size
+        # keep the total running only if someone measured the old window and
+        # no column changed dtype (e.g. float64 -> object); else re-measure lazily
+        if ref is not None and ref() is old and self._df.dtypes.equals(old.dtypes):
+            added = int(self._df.iloc[len(old) :].memory_usage(deep=True, index=False).sum())
+            self._window_size = (weakref.ref(self._df), before + added)
+        self._maybe_spill()
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yield history in order: each spilled chunk, then the in-memory window."""
+        for chunk in self._spilled:
+            yield pd.read_pickle(chunk.path)
+        yield self._df
+
+    def query(self, expr: str) -> pd.DataFrame:
+        """DataFrame.query across all chunks; only matching rows are kept."""
+        parts = [c.query(expr) for c in self.iter_chunks()]
+        return pd.concat(parts, ignore_index=True)
+
+    def _empty(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=self.COLUMNS)
 
     def clear(self) -> None:
-        self._df = pd.DataFrame(columns=self.COLUMNS)
+        self._df = self._empty()
+        self._spilled = ()
+
+    def restore(self, df: pd.DataFrame, spilled: Tuple[SpillChunk, ...] = ()) -> None:
+        """Replace the whole state (used by undo/redo and session resume)."""
+        self._df = df
+        self._spilled = tuple(spilled)
+
+    def truncate(self, rows: int) -> None:
+        """
+        Keep only the first rows rows (undo of an append). Spilled chunks
+        before the cut are kept as they are; a chunk the cut falls inside
+        is read back into the window.
+        """
+        kept, total = 0, 0
+        for chunk in self._spilled:
+            if total + chunk.rows > rows:
+                break
+            kept, total = kept + 1, total + chunk.rows
+        if kept < len(self._spilled) and total < rows:
+            window = pd.read_pickle(self._spilled[kept].path)
+        else:
+            window = self._df  # the cut is in the window or on a chunk boundary
+        self._spilled = self._spilled[:kept]
+        self._df = window.iloc[: rows - total]
 
     def add(self, calc: Calculation) -> None:
         row = {
@@ -32,23 +136,136 @@ class History:
             "operation": calc.operation,
             "result": calc.result,
         }
-        self._df = pd.concat([self._df, pd.DataFrame([row])], ignore_index=True)
+        # object dtype: results may be exact ints past the float range or Decimals
+        self._append(pd.DataFrame([row], dtype=object))
+
+    def add_many(
+        self,
+        timestamp_utc: str,
+        a: Sequence[float],
+        b: Sequence[float],
+        operation: str,
+        result: Sequence[float],
+    ) -> None:
+        """Append a batch of calculations sharing one timestamp in a single concat."""
+        batch = pd.DataFrame(
+            {
+                "timestamp_utc": timestamp_utc,
+                "a": a,
+                "b": b,
+                "operation": operation,
+                "result": result,
+            },
+            columns=self.COLUMNS,
+        )
+        if batch.empty:
+            return
+        self._append(batch)
+
+    def _spill_path(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="calc_history_")
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+        return os.path.join(self._spill_dir, f"chunk_{next(self._chunk_ids):06d}.pkl")
+
+    def write_chunk(self, df: pd.DataFrame) -> SpillChunk:
+        """Persist rows as a new spilled chunk (not yet linked into history)."""
+        path = self._spill_path()
+        try:
+            df.reset_index(drop=True).to_pickle(path)
+        except Exception as e:  # noqa: BLE001
+            raise HistoryError(f"Failed to spill history to {path}: {e}") from e
+        return SpillChunk(path=path, rows=len(df))
+
+    def _maybe_spill(self) -> None:
+        if not self.memory_budget or len(self._df) < 2:
+            return
+        used = self.window_bytes
+        if used <= self.memory_budget:
+            return
+        # keep roughly half the budget resident so spills stay infrequent
+        per_row = used / len(self._df)
+        keep = max(1, int(self.memory_budget / 2 / per_row))
+        cut = len(self._df) - keep
+        chunk = self.write_chunk(self._df.iloc[:cut])
+        self._spilled = self._spilled + (chunk,)
+        self._df = self._df.iloc[cut:].reset_index(drop=True)
+
+    def adopt_chunks(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, SpillChunk]:
+        """Write foreign chunk data into this history's spill dir; old key -> new chunk."""
+        return {key: self.write_chunk(df) for key, df in frames.items()}
 
     def to_csv(self, path: str) -> None:
         try:
-            self._df.to_csv(path, index=False)
+            if not self._spilled:
+                self._df.to_csv(path, index=False)
+                return
+            with open(path, "w", newline="") as f:
+                for i, chunk in enumerate(self.iter_chunks()):
+                    chunk.to_csv(f, index=False, header=(i == 0))
         except Exception as e:  # noqa: BLE001
             raise HistoryError(f"Failed to save history to {path}: {e}") from e
 
+    def to_binary(self, path: str) -> int:
+        """Write the block-compressed columnar format (see history_codec); returns rows."""
+        return write_history_binary(path, self.iter_chunks())
+
+    def save(self, path: str) -> None:
+        """to_binary for *.chb paths, to_csv otherwise."""
+        if path.lower().endswith(BINARY_SUFFIX):
+            self.to_binary(path)
+        else:
+            self.to_csv(path)
+
+    def load(self, path: str) -> None:
+        """Load either format, detected by the binary file's magic bytes."""
+        if is_history_binary(path):
+            self.from_binary(path)
+        else:
+            self.from_csv(path)
+
+    def from_binary(
+        self,
+        path: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        operations: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Load a binary history file, optionally only rows in [since, until]
+        and/or with the given operations; blocks that cannot match are
+        skipped without being decompressed. Floats come back as float64.
+        """
+        blocks = iter_history_binary(path, since=since, until=until, operations=operations)
+        if not self.memory_budget:
+            frames = list(blocks)
+            self.restore(pd.concat(frames, ignore_index=True) if frames else self._empty())
+            return
+        self.clear()
+        for block in blocks:
+            self._append(block)
+
     def from_csv(self, path: str) -> None:
         try:
+            if self.memory_budget:
+                self._from_csv_chunked(path)
+                return
             df = pd.read_csv(path)
             # validate columns
             missing = [c for c in self.COLUMNS if c not in df.columns]
             if missing:
                 raise HistoryError(f"History file missing columns: {missing}")
-            self._df = df[self.COLUMNS].copy()
+            self.restore(df[self.COLUMNS].copy())
         except HistoryError:
             raise
         except Exception as e:  # noqa: BLE001
-            raise HistoryError(f"Failed to load history from {path}: {e}") from e
\ No newline at end of file
+            raise HistoryError(f"Failed to load history from {path}: {e}") from e
+
+    def _from_csv_chunked(self, path: str) -> None:
+        header = pd.read_csv(path, nrows=0)
+        missing = [c for c in self.COLUMNS if c not in header.columns]
+        if missing:
+            raise HistoryError(f"History file missing columns: {missing}")
+        self.clear()
+        for chunk in pd.read_csv(path, usecols=self.COLUMNS, chunksize=CSV_CHUNKSIZE):
+            self._append(chunk[self.COLUMNS])
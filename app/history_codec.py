@@ -0,0 +1,286 @@
+# app/history_codec.py
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import HistoryError
+from .history_columns import NAT_US, float_values, format_timestamps, timestamps_us
+
+# Block-compressed columnar history file:
+#
+#   MAGIC
+#   block*                       zlib( rows | dict | exact | codes | ts deltas | a | b | result )
+#   index                        zlib(JSON list of BlockInfo)
+#   trailer                      index offset (u64) | index length (u64) | MAGIC
+#
+# Inside a block: operation is dictionary-encoded (uint8/uint16 codes into a
+# per-block list of names), timestamps are int64 microsecond deltas from the
+# block's first timestamp, and a/b/result are raw little-endian float64; every
+# fixed-width column is byte-shuffled before the block is compressed.
+#
+# exact is a JSON side column {column: [[row, kind, text], ...]} for the cells
+# those encodings would change: exact ints and Decimals (kept as float64 too,
+# for filters and verify, but rounded or inf there), other non-float values,
+# and timestamps not written in History's own format. Decoding puts them back.
+MAGIC = b"CALCHB02"
+_TRAILER = struct.Struct("<QQ")
+_BLOCK_HEADER = struct.Struct("<IBq")  # rows, code width, first timestamp (us)
+
+BLOCK_ROWS = 65_536
+COMPRESS_LEVEL = 6
+COLUMNS = ["timestamp_utc", "a", "b", "operation", "result"]
+
+
+@dataclass(frozen=True)
+class BlockInfo:
+    offset: int
+    length: int
+    rows: int
+    ts_min: Optional[int]
+    ts_max: Optional[int]
+    operations: List[str]
+
+
+def is_history_binary(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+_EXACT_KINDS = {"int": int, "decimal": Decimal, "str": str}
+_FLOAT_EXACT_INT = 2 ** 53
+
+
+def _exact_cells(col: pd.Series) -> List[list]:
+    # [row, kind, text] for every cell of a/b/result that float64 would not keep
+    if pd.api.types.is_float_dtype(col.dtype):
+        return []
+    if pd.api.types.is_integer_dtype(col.dtype):
+        values = col.to_numpy()
+        rows = np.flatnonzero((values > _FLOAT_EXACT_INT) | (values < -_FLOAT_EXACT_INT))
+        return [[int(row), "int", str(values[row])] for row in rows]
+    if pd.api.types.infer_dtype(col, skipna=True) == "floating":
+        return []
+    cells = []
+    for row, x in enumerate(col):
+        if isinstance(x, (float, np.floating)) or x is None:
+            continue
+        if isinstance(x, (int, np.integer)) and not isinstance(x, bool):
+            if abs(x) > _FLOAT_EXACT_INT:
+                cells.append([row, "int", str(int(x))])
+        elif isinstance(x, Decimal):
+            cells.append([row, "decimal", str(x)])
+        else:
+            cells.append([row, "str", str(x)])
+    return cells
+
+
+def _exact_timestamps(col: pd.Series, us: np.ndarray) -> List[list]:
+    # timestamps that do not come back verbatim from their microsecond value
+    text = col.to_numpy(dtype=object)
+    differs = (text != format_timestamps(us)) & ~col.isna().to_numpy()
+    return [[int(row), "str", str(text[row])] for row in np.flatnonzero(differs)]
+
+
+def _apply_exact(df: pd.DataFrame, exact: Dict[str, List[list]]) -> None:
+    for name, cells in exact.items():
+        values = df[name].to_numpy(dtype=object)
+        for row, kind, text in cells:
+            values[row] = _EXACT_KINDS[kind](text)
+        # explicit object dtype: pandas would try to re-infer (and overflow on) big ints
+        df[name] = pd.Series(values, index=df.index, dtype=object)
+
+
+def _shuffle(arr: np.ndarray) -> bytes:
+    # byte-transpose fixed-width values so that equal high-order bytes (float
+    # exponents, small deltas) sit next to each other for the compressor
+    return arr.view(np.uint8).reshape(-1, arr.itemsize).T.tobytes()
+
+
+def _unshuffle(raw: bytes, offset: int, dtype: str, rows: int) -> np.ndarray:
+    itemsize = np.dtype(dtype).itemsize
+    planes = np.frombuffer(raw, dtype=np.uint8, count=rows * itemsize, offset=offset)
+    return np.ascontiguousarray(planes.reshape(itemsize, rows).T).view(dtype).reshape(rows)
+
+
+def _encode_block(df: pd.DataFrame) -> Tuple[bytes, BlockInfo]:
+    rows = len(df)
+    codes, names = pd.factorize(df["operation"].astype(str))
+    width = 1 if len(names) <= 256 else 2
+    codes = codes.astype("<u1" if width == 1 else "<u2")
+
+    ts = timestamps_us(df["timestamp_utc"])
+    valid = ts != NAT_US
+    first = int(ts[valid][0]) if valid.any() else 0
+    deltas = np.where(valid, ts - first, NAT_US).astype("<i8")
+
+    exact = {"timestamp_utc": _exact_timestamps(df["timestamp_utc"], ts)}
+    for name in ("a", "b", "result"):
+        exact[name] = _exact_cells(df[name])
+    exact_blob = json.dumps({k: v for k, v in exact.items() if v}).encode()
+
+    dict_blob = json.dumps(list(names)).encode()
+    raw = b"".join(
+        [
+            _BLOCK_HEADER.pack(rows, width, first),
+            struct.pack("<I", len(dict_blob)),
+            dict_blob,
+            struct.pack("<I", len(exact_blob)),
+            exact_blob,
+            _shuffle(codes),
+            _shuffle(deltas),
+            _shuffle(float_values(df["a"])),
+            _shuffle(float_values(df["b"])),
+            _shuffle(float_values(df["result"])),
+        ]
+    )
+    info = BlockInfo(
+        offset=0,
+        length=0,
+        rows=rows,
+        ts_min=int(ts[valid].min()) if valid.any() else None,
+        ts_max=int(ts[valid].max()) if valid.any() else None,
+        operations=list(names),
+    )
+    return zlib.compress(raw, COMPRESS_LEVEL), info
+
+
+def _decode_block(blob: bytes) -> Tuple[pd.DataFrame, np.ndarray]:
+    raw = zlib.decompress(blob)
+    rows, width, first = _BLOCK_HEADER.unpack_from(raw, 0)
+    pos = _BLOCK_HEADER.size
+    (dict_len,) = struct.unpack_from("<I", raw, pos)
+    pos += 4
+    names = np.array(json.loads(raw[pos : pos + dict_len]), dtype=object)
+    pos += dict_len
+    (exact_len,) = struct.unpack_from("<I", raw, pos)
+    pos += 4
+    exact = json.loads(raw[pos : pos + exact_len])
+    pos += exact_len
+
+    columns = []
+    for dtype in ("<u1" if width == 1 else "<u2", "<i8", "<f8", "<f8", "<f8"):
+        columns.append(_unshuffle(raw, pos, dtype, rows))
+        pos += rows * np.dtype(dtype).itemsize
+    codes, deltas, a, b, result = columns
+
+    stamps = np.where(deltas == NAT_US, NAT_US, deltas + first)
+    df = pd.DataFrame(
+        {
+            "timestamp_utc": format_timestamps(stamps),
+            "a": a,
+            "b": b,
+            "operation": names[codes] if rows else np.array([], dtype=object),
+            "result": result,
+        },
+        columns=COLUMNS,
+    )
+    _apply_exact(df, exact)
+    return df, stamps
+
+
+def write_history_binary(path: str, frames: Iterable[pd.DataFrame], block_rows: int = BLOCK_ROWS) -> int:
+    """Encode history frames (e.g. History.iter_chunks()) into blocks; returns rows written."""
+    index: List[dict] = []
+    total = 0
+    try:
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            for frame in frames:
+                for start in range(0, len(frame), block_rows):
+                    blob, info = _encode_block(frame.iloc[start : start + block_rows])
+                    entry = info.__dict__ | {"offset": f.tell(), "length": len(blob)}
+                    f.write(blob)
+                    index.append(entry)
+                    total += info.rows
+            index_blob = zlib.compress(json.dumps(index).encode())
+            index_offset = f.tell()
+            f.write(index_blob)
+            f.write(_TRAILER.pack(index_offset, len(index_blob)))
+            f.write(MAGIC)
+    except Exception as e:  # noqa: BLE001
+        raise HistoryError(f"Failed to save history to {path}: {e}") from e
+    return total
+
+
+def read_index(path: str) -> List[BlockInfo]:
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise HistoryError(f"Not a binary history file: {path}")
+            f.seek(-(_TRAILER.size + len(MAGIC)), 2)
+            index_offset, index_len = _TRAILER.unpack(f.read(_TRAILER.size))
+            if f.read(len(MAGIC)) != MAGIC:
+                raise HistoryError(f"Truncated binary history file: {path}")
+            f.seek(index_offset)
+            entries = json.loads(zlib.decompress(f.read(index_len)))
+        return [BlockInfo(**e) for e in entries]
+    except HistoryError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise HistoryError(f"Failed to load history from {path}: {e}") from e
+
+
+def _to_us(ts: Optional[str]) -> Optional[int]:
+    if ts is None:
+        return None
+    t = pd.Timestamp(ts)
+    t = t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+    return int(t.value // 1000)
+
+
+def iter_history_binary(
+    path: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    operations: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield decoded blocks, skipping (without reading or decompressing) every
+    block whose timestamp range lies outside [since, until] or whose
+    dictionary has none of the wanted operations; kept blocks are then
+    filtered row by row.
+    """
+    lo, hi = _to_us(since), _to_us(until)
+    wanted = set(operations) if operations is not None else None
+    filtered = lo is not None or hi is not None or wanted is not None
+    blocks = read_index(path)
+    try:
+        with open(path, "rb") as f:
+            for info in blocks:
+                if lo is not None and (info.ts_max is None or info.ts_max < lo):
+                    continue
+                if hi is not None and (info.ts_min is None or info.ts_min > hi):
+                    continue
+                if wanted is not None and not wanted.intersection(info.operations):
+                    continue
+                f.seek(info.offset)
+                df, stamps = _decode_block(f.read(info.length))
+                if filtered:
+                    df = _filter(df, stamps, lo, hi, wanted)
+                yield df
+    except Exception as e:  # noqa: BLE001
+        raise HistoryError(f"Failed to load history from {path}: {e}") from e
+
+
+def _filter(
+    df: pd.DataFrame, stamps: np.ndarray, lo: Optional[int], hi: Optional[int], wanted: Optional[set]
+) -> pd.DataFrame:
+    keep = np.ones(len(df), dtype=bool)
+    if lo is not None:
+        keep &= (stamps != NAT_US) & (stamps >= lo)
+    if hi is not None:
+        keep &= (stamps != NAT_US) & (stamps <= hi)
+    if wanted is not None:
+        keep &= df["operation"].isin(wanted).to_numpy()
+    return df[keep].reset_index(drop=True)
@@ -0,0 +1,54 @@
+# app/history_columns.py
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Column conversions shared by the binary format, exports, verification and
+# shared-memory history. History columns are object dtype (results may be
+# exact ints or Decimals), these turn them into fixed-width numpy arrays.
+
+# int64 microseconds stand-in for a missing or unparsable timestamp
+NAT_US = np.iinfo(np.int64).min
+
+
+def to_float(x) -> float:
+    """float(x), with exact ints past the float range as +/-inf and non-numbers as nan."""
+    try:
+        return float(x)
+    except OverflowError:
+        # exact ints past the float range (see kernels.exact_pow)
+        return math.inf if x > 0 else -math.inf
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def float_values(col: pd.Series) -> np.ndarray:
+    """A history column as little-endian float64 (vectorized unless a cell needs to_float)."""
+    try:
+        return col.to_numpy(dtype="<f8")
+    except (TypeError, ValueError, OverflowError):
+        return np.array([to_float(x) for x in col], dtype="<f8")
+
+
+def timestamps_us(col: pd.Series) -> np.ndarray:
+    """ISO-8601 timestamp strings as int64 UTC microseconds (NAT_US where unparsable)."""
+    # history rows written by one batch share a timestamp: parse each distinct string once
+    uniq, inverse = np.unique(col.astype(str).to_numpy(), return_inverse=True)
+    ts = pd.to_datetime(pd.Series(uniq), utc=True, errors="coerce", format="ISO8601")
+    us = np.where(ts.isna().to_numpy(), NAT_US, ts.to_numpy(dtype="datetime64[us]").astype(np.int64))
+    return us[inverse.reshape(-1)]
+
+
+def format_timestamps(us: np.ndarray) -> np.ndarray:
+    """Inverse of timestamps_us in History's format (isoformat, +00:00); NAT_US -> ""."""
+    uniq, inverse = np.unique(us, return_inverse=True)
+    text = np.datetime_as_string(uniq.astype("datetime64[us]"), unit="us").astype("<U32")
+    # append the +00:00 offset History writes, in place on the UCS-4 code points
+    chars = text.view(np.uint32).reshape(len(text), 32)
+    chars[:, 26:] = np.frombuffer("+00:00".encode("utf-32-le"), dtype=np.uint32)
+    text = text.astype(object)
+    text[uniq == NAT_US] = ""
+    return text[inverse.reshape(-1)]
@@ -0,0 +1,136 @@
+# app/history_export.py
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, Iterator, Optional
+
+import pandas as pd
+
+from .exceptions import HistoryError
+from .history import History
+from .history_columns import float_values
+
+try:  # Arrow IPC is optional; everything else is stdlib + pandas
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+EXPORT_CHUNKSIZE = 50_000
+
+FORMATS = ("jsonl", "csv", "arrow")
+
+_OPENERS: Dict[str, Callable[..., IO[bytes]]] = {
+    "none": open,
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+_FORMAT_SUFFIXES = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".arrow": "arrow", ".arrows": "arrow"}
+
+
+@dataclass(frozen=True)
+class ExportSummary:
+    rows: int
+    chunks: int
+    fmt: str
+    compression: str
+
+
+def infer_format(path: str) -> tuple[str, str]:
+    """(format, compression) from a path like history.jsonl.gz; jsonl/none by default."""
+    stem, compression = path.lower(), "none"
+    for suffix, name in _COMPRESSION_SUFFIXES.items():
+        if stem.endswith(suffix):
+            stem, compression = stem[: -len(suffix)], name
+            break
+    fmt = next((f for s, f in _FORMAT_SUFFIXES.items() if stem.endswith(s)), "jsonl")
+    return fmt, compression
+
+
+def _pieces(history: History, chunksize: int) -> Iterator[pd.DataFrame]:
+    # spilled chunks and the in-memory window, re-cut to at most chunksize rows
+    for chunk in history.iter_chunks():
+        for start in range(0, len(chunk), chunksize):
+            yield chunk.iloc[start : start + chunksize]
+
+
+def _arrow_schema():
+    return pa.schema(
+        [
+            ("timestamp_utc", pa.string()),
+            ("a", pa.float64()),
+            ("b", pa.float64()),
+            ("operation", pa.string()),
+            ("result", pa.float64()),
+        ]
+    )
+
+
+def _arrow_batch(piece: pd.DataFrame, schema):
+    return pa.record_batch(
+        [
+            pa.array(piece["timestamp_utc"].astype(str).to_numpy(), pa.string()),
+            pa.array(float_values(piece["a"])),
+            pa.array(float_values(piece["b"])),
+            pa.array(piece["operation"].astype(str).to_numpy(), pa.string()),
+            pa.array(float_values(piece["result"])),
+        ],
+        schema=schema,
+    )
+
+
+def export_history(
+    history: History,
+    path: str,
+    fmt: Optional[str] = None,
+    compression: Optional[str] = None,
+    chunksize: int = EXPORT_CHUNKSIZE,
+) -> ExportSummary:
+    """
+    Stream history to JSON Lines, CSV or an Arrow IPC stream, optionally
+    through a stdlib compressor (gzip, bz2, xz). Format and compression
+    default to what the path's suffixes say. Rows are encoded chunksize at
+    a time, so memory use does not grow with history length.
+
+    JSON Lines and CSV keep exact values as written (Decimal results as
+    strings, big ints in full); Arrow stores a/b/result as float64.
+    """
+    inferred_fmt, inferred_comp = infer_format(path)
+    fmt = (fmt or inferred_fmt).lower()
+    compression = (compression or inferred_comp).lower()
+    if fmt not in FORMATS:
+        raise HistoryError(f"Unknown export format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if compression not in _OPENERS:
+        raise HistoryError(f"Unknown compression: {compression} (expected one of {', '.join(_OPENERS)})")
+    if fmt == "arrow" and pa is None:  # pragma: no cover - exercised only without pyarrow
+        raise HistoryError("Arrow export needs the optional 'pyarrow' package.")
+
+    rows = chunks = 0
+    try:
+        with _OPENERS[compression](path, "wb") as raw:
+            writer = None
+            if fmt == "arrow":
+                schema = _arrow_schema()
+                writer = pa.ipc.new_stream(pa.PythonFile(raw, mode="w"), schema)
+            for piece in _pieces(history, chunksize):
+                if fmt == "jsonl":
+                    text = piece.to_json(orient="records", lines=True, default_handler=str)
+                    # older pandas omits the final newline; normalize so chunks concatenate
+                    raw.write((text.rstrip("\n") + "\n").encode())
+                elif fmt == "csv":
+                    raw.write(piece.to_csv(index=False, header=(chunks == 0)).encode())
+                else:
+                    writer.write_batch(_arrow_batch(piece, schema))
+                rows += len(piece)
+                chunks += 1
+            if fmt == "csv" and chunks == 0:
+                raw.write(pd.DataFrame(columns=History.COLUMNS).to_csv(index=False).encode())
+            if writer is not None:
+                writer.close()
+    except Exception as e:  # noqa: BLE001
+        raise HistoryError(f"Failed to export history to {path}: {e}") from e
+    return ExportSummary(rows=rows, chunks=chunks, fmt=fmt, compression=compression)
@@ -0,0 +1,362 @@
+# app/history_shm.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import HistoryError
+from .history import History
+from .history_columns import float_values, format_timestamps, timestamps_us
+
+# Shared history = one small control segment (named by the user) plus a data
+# segment holding the columns, replaced by a larger one when it fills up:
+#
+#   control: MAGIC | generation | epoch | rows | capacity | dict_len | data segment name
+#            | operation dictionary (JSON list, up to DICT_MAX bytes)
+#   data:    timestamp (int64 us)[capacity] | a, b, result (float64)[capacity]
+#            | operation code (uint16)[capacity]
+#
+# The publisher only ever writes rows past `rows`, then bumps `rows` and the
+# generation; while it does, the generation is odd (seqlock), so readers retry
+# instead of seeing a half-updated header. epoch changes when the history is
+# replaced rather than appended to.
+MAGIC = b"CALCSHM1"
+_CONTROL = struct.Struct("<8sQQQQI32s")
+DICT_MAX = 16_384
+_CONTROL_SIZE = _CONTROL.size + DICT_MAX
+_COLUMNS = (("ts", "<i8"), ("a", "<f8"), ("b", "<f8"), ("result", "<f8"), ("op", "<u2"))
+_NAME_MAX = 32
+
+DEFAULT_CAPACITY = 65_536
+POLL_INTERVAL = 1.0
+
+
+def _column_offsets(capacity: int) -> Dict[str, int]:
+    offsets, pos = {}, 0
+    for name, dtype in _COLUMNS:
+        offsets[name] = pos
+        pos += capacity * np.dtype(dtype).itemsize
+    return offsets
+
+
+def _data_size(capacity: int) -> int:
+    return sum(capacity * np.dtype(dtype).itemsize for _, dtype in _COLUMNS)
+
+
+# segments created by publishers in this process (tracked, unlinked on close)
+_OWNED: Set[str] = set()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except (FileNotFoundError, ValueError) as e:
+        raise HistoryError(f"No shared history segment named {name!r}: {e}") from e
+    if name not in _OWNED:
+        # attaching registers the segment with this process's resource
+        # tracker, which would unlink it when the reader exits
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: SLF001
+    return shm
+
+
+def _view(shm: shared_memory.SharedMemory, dtype: str, count: int, offset: int) -> np.ndarray:
+    # frombuffer keeps a buffer export on the mapping, so close() refuses to
+    # unmap it (BufferError) while any view is alive
+    return np.frombuffer(shm.buf, dtype=dtype, count=count, offset=offset)
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # views handed out earlier still export the mapping: drop our handles
+        # and let it unmap when the last view is garbage collected
+        shm._buf = shm._mmap = None  # noqa: SLF001
+        shm.close()
+
+
+@dataclass(frozen=True)
+class SharedColumns:
+    """Read-only numpy views straight onto the shared segment (no copies)."""
+    timestamp_us: np.ndarray
+    a: np.ndarray
+    b: np.ndarray
+    result: np.ndarray
+    op_codes: np.ndarray
+    operations: List[str]
+
+
+class SharedHistoryPublisher:
+    """
+    Owns the shared segments for one history. publish() replaces the shared
+    rows with a History; append() adds rows. Other processes read them with
+    SharedHistoryReader(name).
+    """
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.name = name
+        self._prefix = f"{name}_{os.getpid()}_"
+        if len(self._prefix) + 8 > _NAME_MAX:
+            raise HistoryError(f"Shared history name {name!r} is too long.")
+        try:
+            self._control = shared_memory.SharedMemory(name=name, create=True, size=_CONTROL_SIZE)
+        except FileExistsError as e:
+            raise HistoryError(f"Shared history {name!r} is already published: {e}") from e
+        _OWNED.add(name)
+        self._data: Optional[shared_memory.SharedMemory] = None
+        self._segments = 0
+        self._generation = 0
+        self._epoch = 0
+        self._rows = 0
+        self._ops: List[str] = []
+        self._op_codes: Dict[str, int] = {}
+        self._capacity = 0
+        self._allocate(max(1, capacity))
+        self._write_header()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    def _allocate(self, capacity: int) -> None:
+        self._segments += 1
+        data = shared_memory.SharedMemory(
+            name=f"{self._prefix}{self._segments}", create=True, size=_data_size(capacity)
+        )
+        _OWNED.add(data.name)
+        if self._data is not None:
+            old, old_offsets = self._data, _column_offsets(self._capacity)
+            new_offsets = _column_offsets(capacity)
+            for col, dtype in _COLUMNS:
+                size = self._rows * np.dtype(dtype).itemsize
+                src, dst = old_offsets[col], new_offsets[col]
+                data.buf[dst : dst + size] = old.buf[src : src + size]
+            old.close()
+            # readers that still map the old segment keep their views valid
+            old.unlink()
+            _OWNED.discard(old.name)
+        self._data, self._capacity = data, capacity
+
+    def _write_header(self) -> None:
+        blob = json.dumps(self._ops).encode()
+        header = _CONTROL.pack(
+            MAGIC,
+            self._generation,
+            self._epoch,
+            self._rows,
+            self._capacity,
+            len(blob),
+            self._data.name.encode(),
+        )
+        buf = self._control.buf
+        buf[: _CONTROL.size] = header
+        buf[_CONTROL.size : _CONTROL.size + len(blob)] = blob
+
+    def _begin(self) -> None:
+        self._generation += 1  # odd: update in progress
+        struct.pack_into("<Q", self._control.buf, 8, self._generation)
+
+    def _commit(self) -> None:
+        self._generation += 1
+        self._write_header()
+
+    def _codes(self, operations: pd.Series) -> np.ndarray:
+        codes, names = pd.factorize(operations.astype(str))
+        new = [name for name in names if name not in self._op_codes]
+        if len(json.dumps(self._ops + new).encode()) > DICT_MAX:
+            raise HistoryError(f"Shared history operation dictionary exceeds {DICT_MAX} bytes.")
+        for name in new:
+            self._op_codes[name] = len(self._ops)
+            self._ops.append(name)
+        mapping = np.array([self._op_codes[name] for name in names], dtype="<u2")
+        return mapping[codes]
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Append History-shaped rows; readers see them after their next refresh()."""
+        n = len(df)
+        if not n:
+            return
+        values = {
+            "ts": timestamps_us(df["timestamp_utc"]),
+            "a": float_values(df["a"]),
+            "b": float_values(df["b"]),
+            "result": float_values(df["result"]),
+            "op": self._codes(df["operation"]),
+        }
+        self._begin()
+        if self._rows + n > self._capacity:
+            self._allocate(max(self._capacity * 2, self._rows + n))
+        offsets = _column_offsets(self._capacity)
+        for col, dtype in _COLUMNS:
+            view = _view(self._data, dtype, n, offsets[col] + self._rows * np.dtype(dtype).itemsize)
+            view[:] = values[col]
+        del view
+        self._rows += n
+        self._commit()
+
+    def publish(self, history: History) -> None:
+        """Replace the shared rows with history (one chunk at a time) under a new epoch."""
+        self._begin()
+        self._epoch += 1
+        self._rows = 0
+        self._ops, self._op_codes = [], {}
+        self._commit()
+        for chunk in history.iter_chunks():
+            self.append(chunk)
+
+    def close(self) -> None:
+        """Unlink both segments; attached readers keep their mappings until they close."""
+        for shm in (self._data, self._control):
+            shm.close()
+            shm.unlink()
+            _OWNED.discard(shm.name)
+
+
+class SharedHistoryReader:
+    """
+    Read-only, zero-copy view of a published history. The float columns of
+    columns(), df and iter_chunks() are backed by the shared segment; only
+    timestamp strings and operation names are materialized. refresh() picks
+    up rows appended since the last call, re-attaching if the publisher
+    moved to a larger segment.
+
+    Provides len(), iter_chunks(), df and query() like History, so
+    verify_history and export_history accept it.
+    """
+
+    def __init__(self, name: str, retries: int = 1_000) -> None:
+        self.name = name
+        self._retries = retries
+        self._control = _attach(name)
+        self._data: Optional[shared_memory.SharedMemory] = None
+        self.generation = self.epoch = self.rows = self._capacity = 0
+        self._ops: List[str] = []
+        self.refresh()
+
+    def _read_header(self):
+        for _ in range(self._retries):
+            magic, gen, epoch, rows, capacity, dict_len, data_name = _CONTROL.unpack_from(self._control.buf, 0)
+            if magic != MAGIC:
+                raise HistoryError(f"Shared memory {self.name!r} is not a calculator history.")
+            if gen % 2:
+                time.sleep(0)
+                continue
+            blob = bytes(self._control.buf[_CONTROL.size : _CONTROL.size + dict_len])
+            if struct.unpack_from("<Q", self._control.buf, 8)[0] == gen:
+                return gen, epoch, rows, capacity, data_name.rstrip(b"\0").decode(), json.loads(blob)
+        raise HistoryError(f"Shared history {self.name!r} is busy; try again.")
+
+    def refresh(self) -> bool:
+        """Re-read the header; True if the publisher changed anything since the last refresh."""
+        gen, epoch, rows, capacity, data_name, ops = self._read_header()
+        if gen == self.generation and self._data is not None:
+            return False
+        if self._data is None or self._data.name != data_name:
+            data = _attach(data_name)
+            if self._data is not None:
+                _release(self._data)
+            self._data = data
+        self.generation, self.epoch, self.rows, self._capacity, self._ops = gen, epoch, rows, capacity, ops
+        return True
+
+    def columns(self) -> SharedColumns:
+        offsets = _column_offsets(self._capacity)
+        views = {}
+        for col, dtype in _COLUMNS:
+            view = _view(self._data, dtype, self.rows, offsets[col])
+            view.flags.writeable = False
+            views[col] = view
+        return SharedColumns(
+            timestamp_us=views["ts"],
+            a=views["a"],
+            b=views["b"],
+            result=views["result"],
+            op_codes=views["op"],
+            operations=list(self._ops),
+        )
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def df(self) -> pd.DataFrame:
+        cols = self.columns()
+        ops = np.array(cols.operations, dtype=object)
+        return pd.DataFrame(
+            {
+                "timestamp_utc": format_timestamps(cols.timestamp_us),
+                "a": cols.a,
+                "b": cols.b,
+                "operation": ops[cols.op_codes] if self.rows else np.array([], dtype=object),
+                "result": cols.result,
+            },
+            columns=History.COLUMNS,
+            copy=False,
+        )
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        yield self.df
+
+    def query(self, expr: str) -> pd.DataFrame:
+        return self.df.query(expr)
+
+    def close(self) -> None:
+        _release(self._data)
+        _release(self._control)
+
+
+def serve_history_file(
+    path: str,
+    publisher: SharedHistoryPublisher,
+    stop: threading.Event,
+    interval: float = POLL_INTERVAL,
+) -> None:
+    """
+    Daemon loop: publish the history file at path and keep the shared copy
+    current. When the file changes (e.g. another process autosaves), rows
+    past the published count are appended if the rows already published are
+    unchanged; anything else (a shorter file, or undo followed by a new
+    calculation rewriting the tail) is republished under a new epoch.
+    """
+    mtime = None
+    published = None  # digest of the rows currently shared
+    while not stop.is_set():
+        try:
+            current = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            current = None
+        if current is not None and current != mtime:
+            mtime = current
+            history = History()
+            history.load(path)
+            df = history.df
+            unchanged = (
+                published is not None
+                and len(df) >= publisher.rows
+                and _digest(df.iloc[: publisher.rows]) == published
+            )
+            if unchanged:
+                publisher.append(df.iloc[publisher.rows :])
+            else:
+                publisher.publish(history)
+            published = _digest(df)
+        stop.wait(interval)
+
+
+def _digest(df: pd.DataFrame) -> bytes:
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.blake2b(hashes.tobytes(), digest_size=16).digest()
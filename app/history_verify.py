@@ -0,0 +1,157 @@
+# app/history_verify.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import HistoryError, OperationNotFoundError
+from .history import CSV_CHUNKSIZE, History
+from .history_codec import is_history_binary, iter_history_binary
+from .history_columns import float_values
+from .operations import OperationFactory
+
+MAX_REPORTED_MISMATCHES = 20
+
+
+@dataclass(frozen=True)
+class TolerancePolicy:
+    """
+    A stored result matches its recomputation when
+        |stored - expected| <= max(rel_tol * max(|stored|, |expected|), abs_tol)
+    Non-finite values match only themselves (nan == nan, inf == inf), so a
+    recorded overflow is not flagged but a finite value against inf is.
+    """
+    rel_tol: float = 1e-9
+    abs_tol: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.rel_tol < 0 or self.abs_tol < 0:
+            raise HistoryError("Tolerances must be non-negative.")
+
+    def matches(self, stored: np.ndarray, expected: np.ndarray) -> np.ndarray:
+        finite = np.isfinite(stored) & np.isfinite(expected)
+        with np.errstate(all="ignore"):
+            scale = np.maximum(np.abs(stored), np.abs(expected))
+            close = finite & (np.abs(stored - expected) <= np.maximum(self.rel_tol * scale, self.abs_tol))
+        both_nan = np.isnan(stored) & np.isnan(expected)
+        return close | both_nan | (stored == expected)
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    row: int
+    operation: str
+    a: float
+    b: float
+    stored: float
+    expected: float
+
+
+@dataclass
+class VerifyReport:
+    rows: int = 0
+    checked: Dict[str, int] = field(default_factory=dict)
+    skipped: Dict[str, int] = field(default_factory=dict)
+    mismatch_counts: Dict[str, int] = field(default_factory=dict)
+    mismatches: List[Mismatch] = field(default_factory=list)
+
+    @property
+    def mismatch_count(self) -> int:
+        return sum(self.mismatch_counts.values())
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatch_count == 0
+
+    def summary(self) -> str:
+        checked = sum(self.checked.values())
+        lines = [f"{self.rows} rows, {checked} checked, {self.mismatch_count} mismatches"]
+        for op in sorted(self.checked):
+            lines.append(f"  {op}: {self.checked[op]} checked, {self.mismatch_counts.get(op, 0)} mismatches")
+        if self.skipped:
+            detail = ", ".join(f"{k}={v}" for k, v in sorted(self.skipped.items()))
+            lines.append(f"  skipped (not a binary operation): {detail}")
+        for m in self.mismatches:
+            lines.append(f"  [{m.row}] {m.operation} {m.a} {m.b}: stored {m.stored}, expected {m.expected}")
+        if self.mismatch_count > len(self.mismatches):
+            lines.append(f"  ... {self.mismatch_count - len(self.mismatches)} more mismatches")
+        return "\n".join(lines)
+
+
+def verify_frames(
+    frames: Iterable[pd.DataFrame],
+    policy: Optional[TolerancePolicy] = None,
+    max_reported: int = MAX_REPORTED_MISMATCHES,
+) -> VerifyReport:
+    """
+    Recompute every row's result from a and b and compare it with the stored
+    one. Rows are grouped by operation per frame and each group goes through
+    the strategy's vectorized execute_array in one call; operations the
+    factory does not know (e.g. dataset summary rows) are counted as skipped.
+    """
+    policy = policy or TolerancePolicy()
+    report = VerifyReport()
+    for frame in frames:
+        offset, report.rows = report.rows, report.rows + len(frame)
+        if frame.empty:
+            continue
+        a_all = float_values(frame["a"])
+        b_all = float_values(frame["b"])
+        stored_all = float_values(frame["result"])
+        for name, pos in frame.groupby("operation", sort=False).indices.items():
+            name = str(name)
+            try:
+                strategy = OperationFactory.create(name)
+            except OperationNotFoundError:
+                report.skipped[name] = report.skipped.get(name, 0) + len(pos)
+                continue
+            a, b, stored = a_all[pos], b_all[pos], stored_all[pos]
+            with np.errstate(all="ignore"):
+                expected = np.asarray(strategy.execute_array(a, b), dtype=float)
+            bad = np.flatnonzero(~policy.matches(stored, expected))
+            report.checked[name] = report.checked.get(name, 0) + len(pos)
+            if not len(bad):
+                continue
+            report.mismatch_counts[name] = report.mismatch_counts.get(name, 0) + len(bad)
+            for i in bad[: max(0, max_reported - len(report.mismatches))]:
+                report.mismatches.append(
+                    Mismatch(
+                        row=offset + int(pos[i]),
+                        operation=name,
+                        a=float(a[i]),
+                        b=float(b[i]),
+                        stored=float(stored[i]),
+                        expected=float(expected[i]),
+                    )
+                )
+    report.mismatches.sort(key=lambda m: m.row)
+    return report
+
+
+def verify_history(
+    history: History, policy: Optional[TolerancePolicy] = None, max_reported: int = MAX_REPORTED_MISMATCHES
+) -> VerifyReport:
+    """verify_frames over a History, one spilled chunk at a time."""
+    return verify_frames(history.iter_chunks(), policy, max_reported)
+
+
+def _file_frames(path: str) -> Iterator[pd.DataFrame]:
+    if is_history_binary(path):
+        yield from iter_history_binary(path)
+        return
+    try:
+        reader = pd.read_csv(path, usecols=History.COLUMNS, chunksize=CSV_CHUNKSIZE)
+        for chunk in reader:
+            yield chunk
+    except Exception as e:  # noqa: BLE001
+        raise HistoryError(f"Failed to load history from {path}: {e}") from e
+
+
+def verify_file(
+    path: str, policy: Optional[TolerancePolicy] = None, max_reported: int = MAX_REPORTED_MISMATCHES
+) -> VerifyReport:
+    """verify_frames over a saved history file (CSV or binary), streamed block by block."""
+    return verify_frames(_file_frames(path), policy, max_reported)
@@ -1,10 +1,17 @@
 # app/input_validators.py
 from __future__ import annotations
 
-from typing import Tuple
+import re
+from typing import List, Tuple, Union
+
+import numpy as np
 
 from .exceptions import InvalidInputError
 
+# an operand is a bracketed list, a range(...) call, or a bare token
+_OPERAND_RE = re.compile(r"\[[^\]]*\]|range\([^)]*\)|\S+", re.IGNORECASE)
+_RANGE_RE = re.compile(r"^range\((.*)\)$", re.IGNORECASE)
+
 
 def parse_two_floats(tokens: list[str]) -> Tuple[float, float]:
     """
@@ -19,6 +26,39 @@ def parse_two_floats(tokens: list[str]) -> Tuple[float, float]:
         raise InvalidInputError(f"Invalid number(s): {tokens}") from e
 
 
+def split_operands(text: str) -> List[str]:
+    """Split operand text, keeping `[1, 2]` and `range(1, 10)` as single tokens."""
+    return _OPERAND_RE.findall(text)
+
+
+def parse_operand(token: str) -> Union[float, np.ndarray]:
+    """
+    Parse one operand: a number, a vector `[1,2,3]`, or `range(start, stop[, step])`
+    (stop is exclusive, like Python's range). Vectors come back as float arrays.
+    """
+    t = token.strip()
+    try:
+        if t.startswith("[") and t.endswith("]"):
+            inner = t[1:-1].strip()
+            if not inner:
+                raise InvalidInputError("Array operand cannot be empty.")
+            return np.array([float(x) for x in inner.split(",")], dtype=float)
+        m = _RANGE_RE.match(t)
+        if m:
+            args = [float(x) for x in m.group(1).split(",")]
+            if not 1 <= len(args) <= 3:
+                raise InvalidInputError("range() takes 1 to 3 arguments.")
+            arr = np.arange(*args, dtype=float)
+            if arr.size == 0:
+                raise InvalidInputError(f"Empty range operand: {token}")
+            return arr
+        return float(t)
+    except InvalidInputError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise InvalidInputError(f"Invalid operand: {token}") from e
+
+
 def normalize_command(line: str) -> str:
     if line is None:
         raise InvalidInputError("Input cannot be None.")
@@ -35,4 +75,7 @@ def is_command(line: str) -> bool:
         "redo",
         "save",
         "load",
+        "checkpoint",
+        "resume",
+        "precision",
     }
\ No newline at end of file
@@ -0,0 +1,141 @@
+# app/kernels.py
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+# Exact integer results are only produced up to this many bits; beyond it
+# callers fall back to the float path (and int -> str stays well inside
+# Python's default 4300-digit conversion limit).
+EXACT_POW_MAX_BITS = 4096
+
+# uint64 products of two residues stay exact while m <= 2**32
+_MODPOW_VECTOR_MAX_MOD = 2 ** 32
+
+
+def is_integral(x: float) -> bool:
+    return float(x).is_integer()
+
+
+# --- scalar kernels ----------------------------------------------------------
+
+def iroot(n: int, k: int) -> int:
+    """Floor of the k-th root of n >= 0 (math.isqrt for k == 2, integer Newton otherwise)."""
+    if n < 0 or k < 1:
+        raise ValueError("iroot needs n >= 0 and k >= 1.")
+    if k == 2:
+        return math.isqrt(n)
+    if n < 2 or k == 1:
+        return n
+    if k >= n.bit_length():
+        # n < 2 ** k, so the root is below 2 (and Newton would square huge powers)
+        return 1
+    # start above the root: 2 ** ceil(bits / k)
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def modpow(a: int, b: int, m: int) -> int:
+    """(a ** b) mod m for b >= 0, m >= 1 (square-and-multiply on residues via pow())."""
+    if b < 0 or m < 1:
+        raise ValueError("modpow needs b >= 0 and m >= 1.")
+    return pow(a, b, m)
+
+
+def exact_pow(a: float, b: float):
+    """
+    Integer a ** non-negative integer b computed exactly. Returns a float when
+    it is exactly representable (|r| <= 2**53), the exact int when larger, and
+    None when the operands are not integers or the result would exceed
+    EXACT_POW_MAX_BITS (callers then use the generic float path).
+    """
+    if not (is_integral(a) and is_integral(b)) or b < 0:
+        return None
+    base, exp = int(a), int(b)
+    # lower bound on the result's bit length; passing it keeps the result
+    # under 2 * EXACT_POW_MAX_BITS bits
+    if abs(base) > 1 and exp * (abs(base).bit_length() - 1) > EXACT_POW_MAX_BITS:
+        return None
+    # CPython's int pow is exponentiation by squaring on exact integers
+    r = base ** exp
+    return float(r) if abs(r) <= 2 ** 53 else r
+
+
+def real_root(a: float, n: float) -> float:
+    """
+    Real n-th root. Exact for perfect powers of integers, sign-preserving
+    for odd integer n, ValueError for even roots of negatives and n == 0.
+    """
+    if n == 0:
+        raise ValueError("Zeroth root undefined.")
+    if is_integral(n) and n > 0:
+        k = int(n)
+        if a < 0 and k % 2 == 0:
+            raise ValueError("Even root of a negative number.")
+        sign = -1.0 if a < 0 else 1.0
+        mag = abs(a)
+        r = mag ** (1.0 / k)
+        if is_integral(mag):
+            if mag <= 2 ** 53:
+                # a perfect power's float root is within an ulp of the integer
+                cand = round(r)
+                if cand ** k == int(mag):
+                    return sign * float(cand)
+            elif k < int(mag).bit_length():
+                # past 2**53 the float root may be off by more than 0.5; a
+                # degree of at least the bit length only has the root 1
+                cand = iroot(int(mag), k)
+                if cand ** k == int(mag):
+                    return sign * float(cand)
+        return sign * r
+    if a < 0:
+        raise ValueError("Root of a negative number needs a positive odd integer degree.")
+    return a ** (1.0 / n)
+
+
+# --- vectorized kernels ------------------------------------------------------
+# Power.execute_array keeps np.power: a square-and-multiply array kernel was
+# measured slower than numpy's pow loop at every exponent size.
+
+def root_array(a: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """
+    Vectorized real_root: odd roots of negatives are real, perfect integer
+    powers come out exact, and even roots of negatives / zeroth roots are nan.
+    """
+    a, n = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(n, dtype=float))
+    with np.errstate(all="ignore"):
+        integral = (n == np.round(n)) & (n > 0)
+        odd = integral & (np.mod(n, 2) == 1)
+        # cbrt is both faster and correctly signed for the common cube root
+        mag = np.where(n == 3, np.cbrt(np.abs(a)), np.power(np.abs(a), 1.0 / n))
+        res = np.where(a < 0, np.where(odd, -mag, np.nan), np.power(a, 1.0 / n))
+        # snap results that are one rounding away from an exact integer root
+        snapped = np.round(res)
+        exact = integral & (np.power(snapped, n) == a)
+        res = np.where(exact, snapped, res)
+        return np.where(n == 0, np.nan, res)
+
+
+def modpow_array(a: np.ndarray, b: np.ndarray, m: int) -> np.ndarray:
+    """Vectorized (a ** b) mod m over non-negative integer arrays, for 1 <= m <= 2**32."""
+    if not 1 <= m <= _MODPOW_VECTOR_MAX_MOD:
+        raise ValueError(f"modpow_array needs 1 <= m <= {_MODPOW_VECTOR_MAX_MOD}.")
+    a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+    if (a < 0).any() or (b < 0).any():
+        raise ValueError("modpow_array needs non-negative operands.")
+    mod = np.uint64(m)
+    base = a.astype(np.uint64) % mod
+    exp = b.astype(np.uint64)
+    result = np.full(base.shape, 1 % m, dtype=np.uint64)
+    one = np.uint64(1)
+    while exp.any():
+        odd = (exp & one).astype(bool)
+        result[odd] = result[odd] * base[odd] % mod
+        exp >>= one
+        base = base * base % mod
+    return result
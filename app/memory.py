@@ -0,0 +1,142 @@
+# app/memory.py
+from __future__ import annotations
+
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .calculator_memento import CalculatorMemento
+from .history import History
+
+TOP_SITES = 5
+
+# shared code/type objects; a bound method would also lead back into its owner
+_NOT_FOLLOWED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+class MemoryBudgetWarning(RuntimeWarning):
+    """Accounted calculator memory crossed CalculatorConfig.memory_warn_bytes."""
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Bytes held by a DataFrame, object cells (strings, big ints, Decimals) included."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def deep_sizeof(obj: object) -> int:
+    """
+    Approximate retained size of an object graph: sys.getsizeof over the
+    object, its __dict__/__slots__ and container items, each counted once.
+    Modules, classes and functions are shared, so they are not followed.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _NOT_FOLLOWED):
+            continue
+        seen.add(id(o))
+        if isinstance(o, pd.DataFrame):
+            total += frame_bytes(o)
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        if hasattr(o, "__dict__"):
+            stack.append(vars(o))
+        for slot in getattr(type(o), "__slots__", ()):
+            if hasattr(o, slot):
+                stack.append(getattr(o, slot))
+    return total
+
+
+def mementos_bytes(mementos: Iterable[CalculatorMemento]) -> int:
+    return sum(m.nbytes for m in mementos)
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """
+    Bytes per calculator subsystem. history is the in-memory window (spilled
+    chunks live on disk and are only counted in spilled_rows); undo/redo are
+    the memento DataFrames; observers is a deep_sizeof estimate. traced_*
+    and top_sites come from tracemalloc and are None/empty unless tracing.
+    """
+    subsystems: Dict[str, int]
+    undo_entries: int
+    redo_entries: int
+    spilled_rows: int
+    traced_current: Optional[int] = None
+    traced_peak: Optional[int] = None
+    top_sites: List[Tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.subsystems.values())
+
+    def summary(self) -> str:
+        lines = [f"accounted {_fmt(self.total)}"]
+        counts = {
+            "history": f"{self.spilled_rows} rows spilled to disk",
+            "undo": f"{self.undo_entries} entries",
+            "redo": f"{self.redo_entries} entries",
+        }
+        for name, size in self.subsystems.items():
+            extra = f" ({counts[name]})" if name in counts else ""
+            lines.append(f"  {name:<9} {_fmt(size):>10}{extra}")
+        if self.traced_current is None:
+            lines.append("  tracemalloc off (memory trace on)")
+        else:
+            lines.append(f"  traced    {_fmt(self.traced_current):>10} (peak {_fmt(self.traced_peak)})")
+            for site, size in self.top_sites:
+                lines.append(f"    {_fmt(size):>10}  {site}")
+        return "\n".join(lines)
+
+
+def _fmt(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def _top_sites(limit: int) -> List[Tuple[str, int]]:
+    stats = tracemalloc.take_snapshot().statistics("filename")
+    return [(str(s.traceback[0].filename), s.size) for s in stats[:limit]]
+
+
+def measure(
+    history: History,
+    undo: Sequence[CalculatorMemento],
+    redo: Sequence[CalculatorMemento],
+    observers: Sequence[object],
+    top_sites: int = TOP_SITES,
+) -> MemoryReport:
+    traced_current = traced_peak = None
+    sites: List[Tuple[str, int]] = []
+    if tracemalloc.is_tracing():
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+        sites = _top_sites(top_sites)
+    return MemoryReport(
+        subsystems={
+            "history": history.window_bytes,
+            "undo": mementos_bytes(undo),
+            "redo": mementos_bytes(redo),
+            "observers": deep_sizeof(list(observers)),
+        },
+        undo_entries=len(undo),
+        redo_entries=len(redo),
+        spilled_rows=sum(c.rows for c in history.spilled),
+        traced_current=traced_current,
+        traced_peak=traced_peak,
+        top_sites=sites,
+    )
@@ -2,18 +2,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Protocol, Type
+from typing import Dict, Protocol, Type, Union
 
-from .exceptions import DivisionByZeroError, OperationNotFoundError
+import numpy as np
+
+from .exceptions import DivisionByZeroError, InvalidInputError, OperationNotFoundError
+from .kernels import exact_pow, real_root, root_array
+
+Operand = Union[float, np.ndarray]
 
 
 class OperationStrategy(Protocol):
-    """Strategy Pattern: each operation is a strategy with an execute method."""
+    """
+    Strategy Pattern: each operation is a strategy with an execute method.
+    execute_array is the broadcasting form; it never raises for domain
+    errors and leaves non-finite values (nan/inf) in their place instead.
+    """
     symbol: str
     name: str
 
     def execute(self, a: float, b: float) -> float: ...
 
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray: ...
+
 
 @dataclass(frozen=True)
 class Add:
@@ -23,6 +34,9 @@ class Add:
     def execute(self, a: float, b: float) -> float:
         return a + b
 
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.add(a, b)
+
 
 @dataclass(frozen=True)
 class Subtract:
@@ -32,6 +46,9 @@ class Subtract:
     def execute(self, a: float, b: float) -> float:
         return a - b
 
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.subtract(a, b)
+
 
 @dataclass(frozen=True)
 class Multiply:
@@ -41,6 +58,9 @@ class Multiply:
     def execute(self, a: float, b: float) -> float:
         return a * b
 
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.multiply(a, b)
+
 
 @dataclass(frozen=True)
 class Divide:
@@ -53,6 +73,10 @@ class Divide:
             raise DivisionByZeroError("Cannot divide by zero.")
         return a / b
 
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        # b == 0 yields inf/nan, reported per element by execute_batch
+        return np.divide(a, b)
+
 
 @dataclass(frozen=True)
 class Power:
@@ -60,7 +84,12 @@ class Power:
     name: str = "pow"
 
     def execute(self, a: float, b: float) -> float:
-        return a ** b
+        # integer powers are exact (an int when past float precision)
+        exact = exact_pow(a, b)
+        return a ** b if exact is None else exact
+
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.power(a, b)
 
 
 @dataclass(frozen=True)
@@ -71,14 +100,67 @@ class Root:
     def execute(self, a: float, b: float) -> float:
         # EAFP example: attempt, then handle invalid cases
         try:
-            if b == 0:
-                raise ValueError("Zeroth root undefined.")
-            # nth root: a ** (1/b)
-            return a ** (1.0 / b)
+            # real nth root; exact for perfect powers, real for odd roots of negatives
+            return real_root(a, b)
         except Exception as e:  # noqa: BLE001
             # wrap as ValueError for the caller to interpret if needed
             raise ValueError(f"Invalid root operation: {e}") from e
 
+    def execute_array(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return root_array(a, b)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one operation broadcast over array operands."""
+    a: np.ndarray
+    b: np.ndarray
+    result: np.ndarray
+    errors: Dict[int, str]
+
+    @property
+    def ok(self) -> np.ndarray:
+        """Boolean mask of elements that evaluated without a domain error."""
+        mask = np.ones(self.result.shape, dtype=bool)
+        mask[list(self.errors)] = False
+        return mask
+
+
+def execute_batch(strategy: OperationStrategy, a: Operand, b: Operand) -> BatchResult:
+    """
+    Evaluate a strategy over broadcast operands in one vectorized call.
+    Elements that come out non-finite from finite inputs are re-run through
+    the scalar execute() so each one gets the same error message a single
+    calculation would; the rest of the batch is unaffected.
+    """
+    try:
+        a_arr, b_arr = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(a, dtype=float)),
+            np.atleast_1d(np.asarray(b, dtype=float)),
+        )
+    except ValueError as e:
+        raise InvalidInputError(f"Operands cannot be broadcast together: {e}") from e
+
+    with np.errstate(all="ignore"):
+        result = np.asarray(strategy.execute_array(a_arr, b_arr), dtype=float)
+
+    errors: Dict[int, str] = {}
+    bad = ~np.isfinite(result) & np.isfinite(a_arr) & np.isfinite(b_arr)
+    for i in np.flatnonzero(bad):
+        try:
+            value = strategy.execute(float(a_arr[i]), float(b_arr[i]))
+            if isinstance(value, int):
+                # exact big-int power: fine as a scalar calculation, not as float64
+                errors[int(i)] = (
+                    f"Result exceeds float range ({len(str(abs(value)))} digits); "
+                    "calculate it on its own for the exact value"
+                )
+            else:
+                errors[int(i)] = f"Non-finite or non-real result: {value}"
+        except Exception as e:  # noqa: BLE001
+            errors[int(i)] = str(e)
+    return BatchResult(a=a_arr, b=b_arr, result=result, errors=errors)
+
 
 class OperationFactory:
     """Factory Pattern: build operations based on user token."""
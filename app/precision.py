@@ -0,0 +1,191 @@
+# app/precision.py
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal, localcontext
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .operations import OperationStrategy
+
+Number = Union[float, Decimal]
+
+_SPLITTER = 134217729.0  # 2**27 + 1, Dekker/Veltkamp split constant
+_SPLIT_LIMIT = 2.0 ** 996  # beyond this the split itself can overflow
+_EXACT_INT_LIMIT = 2.0 ** 53
+
+
+def to_decimal(x: float) -> Decimal:
+    """The shortest decimal that round-trips to x, i.e. what the user typed."""
+    return Decimal(int(x)) if x.is_integer() and abs(x) < _EXACT_INT_LIMIT else Decimal(repr(x))
+
+
+def two_sum(a: float, b: float) -> Tuple[float, float]:
+    """Knuth's error-free sum: s + err == a + b exactly."""
+    s = a + b
+    bb = s - a
+    err = (a - (s - bb)) + (b - bb)
+    return s, err
+
+
+def _split(a: float) -> Tuple[float, float]:
+    c = _SPLITTER * a
+    hi = c - (c - a)
+    return hi, a - hi
+
+
+def two_product(a: float, b: float) -> Tuple[float, float]:
+    """Dekker's error-free product: p + err == a * b exactly (no fma needed)."""
+    p = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+    err = ((a_hi * b_hi - p) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+    return p, err
+
+
+@dataclass
+class PrecisionStats:
+    evaluations: int = 0
+    escalations: int = 0
+    reasons: Counter = field(default_factory=Counter)
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.evaluations if self.evaluations else 0.0
+
+    def summary(self) -> str:
+        detail = ", ".join(f"{k}={v}" for k, v in sorted(self.reasons.items()))
+        line = (
+            f"evaluations={self.evaluations} escalations={self.escalations} "
+            f"({self.escalation_rate:.1%})"
+        )
+        return f"{line} [{detail}]" if detail else line
+
+
+class AdaptiveEngine:
+    """
+    Float fast path with per-operation escalation to Decimal.
+
+    Every operation first runs the ordinary strategy on floats. The result
+    is kept unless one of these checks fires, in which case only that
+    operation is recomputed in Decimal at `precision` digits, starting from
+    the operands' shortest decimal form (what the user typed):
+      - overflow:     finite operands but a non-finite/overflowing result
+      - inexact:      the binary operation rounded (error-free transformation
+                      residual for add/sub/mul/div, negative integer powers)
+      - cancellation: add/sub lost most of its magnitude (|r| < ratio *
+                      (|a| + |b|)) with non-integer operands, amplifying
+                      their representation error
+    pow with a non-integer exponent and root are transcendental and stay on
+    the float path.
+    """
+
+    def __init__(self, precision: int = 28, cancellation_ratio: float = 0.5) -> None:
+        self.precision = precision
+        self.cancellation_ratio = cancellation_ratio
+        self.stats = PrecisionStats()
+        self._checks: Dict[str, Callable[[float, float, float], Optional[str]]] = {
+            "add": self._check_add,
+            "sub": self._check_sub,
+            "mul": self._check_mul,
+            "div": self._check_div,
+            "pow": self._check_pow,
+        }
+
+    def execute(self, strategy: OperationStrategy, a: float, b: float) -> Number:
+        self.stats.evaluations += 1
+        a, b = float(a), float(b)
+        check = self._checks.get(strategy.name)
+        try:
+            result = strategy.execute(a, b)
+        except OverflowError:
+            if check is None:
+                raise
+            return self._escalate(strategy.name, a, b, "overflow")
+
+        if check is None or not isinstance(result, float):
+            return result
+        if not (math.isfinite(a) and math.isfinite(b)):
+            return result
+        if not math.isfinite(result):
+            return self._escalate(strategy.name, a, b, "overflow")
+        reason = check(a, b, result)
+        if reason is None:
+            return result
+        return self._escalate(strategy.name, a, b, reason)
+
+    def wrap(self, strategy: OperationStrategy) -> "AdaptiveStrategy":
+        return AdaptiveStrategy(inner=strategy, engine=self)
+
+    # --- checks: return an escalation reason or None -----------------------
+
+    def _cancelled(self, a: float, b: float, r: float) -> bool:
+        if a.is_integer() and b.is_integer():
+            return False
+        return abs(r) < self.cancellation_ratio * (abs(a) + abs(b))
+
+    def _check_add(self, a: float, b: float, r: float) -> Optional[str]:
+        if two_sum(a, b)[1] != 0:
+            return "inexact"
+        return "cancellation" if self._cancelled(a, b, r) else None
+
+    def _check_sub(self, a: float, b: float, r: float) -> Optional[str]:
+        return self._check_add(a, -b, r)
+
+    def _check_mul(self, a: float, b: float, r: float) -> Optional[str]:
+        if abs(a) > _SPLIT_LIMIT or abs(b) > _SPLIT_LIMIT:
+            return "inexact"
+        return "inexact" if two_product(a, b)[1] != 0 else None
+
+    def _check_div(self, a: float, b: float, r: float) -> Optional[str]:
+        if abs(r) > _SPLIT_LIMIT or abs(b) > _SPLIT_LIMIT:
+            return "inexact"
+        p, e = two_product(r, b)
+        return "inexact" if (a - p) - e != 0 else None
+
+    def _check_pow(self, a: float, b: float, r: float) -> Optional[str]:
+        if not (a.is_integer() and b.is_integer()):
+            return None
+        # non-negative integer powers are already exact (kernels.exact_pow)
+        return "inexact" if b < 0 else None
+
+    # --- exact path ----------------------------------------------------------
+
+    def _escalate(self, op: str, a: float, b: float, reason: str) -> Decimal:
+        self.stats.escalations += 1
+        self.stats.reasons[reason] += 1
+        da, db = to_decimal(a), to_decimal(b)
+        with localcontext() as ctx:
+            ctx.prec = self.precision
+            if op == "add":
+                return +(da + db)
+            if op == "sub":
+                return +(da - db)
+            if op == "mul":
+                return +(da * db)
+            if op == "div":
+                return +(da / db)
+            return +(da ** db)
+
+
+@dataclass(frozen=True)
+class AdaptiveStrategy:
+    """Decorator over a strategy that routes execute() through an AdaptiveEngine."""
+    inner: OperationStrategy
+    engine: AdaptiveEngine
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def symbol(self) -> str:
+        return self.inner.symbol
+
+    def execute(self, a: float, b: float) -> Number:
+        return self.engine.execute(self.inner, a, b)
+
+    def execute_array(self, a, b):
+        # the vectorized path stays on floats
+        return self.inner.execute_array(a, b)
@@ -0,0 +1,60 @@
+"""
+History export throughput and memory.
+
+    python -m benchmarks.bench_export [rows]
+
+Exports a synthetic history in every format/compression and reports rows/s,
+output size, and tracemalloc peak (which should track the chunk size, not
+the history length).
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.history import History
+from app.history_export import export_history
+
+CASES = [
+    ("jsonl", "none"),
+    ("jsonl", "gzip"),
+    ("csv", "none"),
+    ("csv", "gzip"),
+    ("arrow", "none"),
+    ("arrow", "xz"),
+]
+
+
+def build_history(rows: int) -> History:
+    h = History()
+    a = np.random.default_rng(0).random(rows) * 100
+    h.add_many("2024-01-01T00:00:00+00:00", a, np.full(rows, 2.0), "mul", a * 2)
+    return h
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    history = build_history(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, compression in CASES:
+            path = os.path.join(tmp, f"history.{fmt}")
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            export_history(history, path, fmt, compression)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = os.path.getsize(path)
+            print(
+                f"{fmt:<6} {compression:<5} {rows / elapsed:>12,.0f} rows/s "
+                f"{size / 1e6:8.1f} MB  peak {peak / 1e6:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
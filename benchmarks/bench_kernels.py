@@ -0,0 +1,71 @@
+"""
+Power/Root kernel benchmarks against the generic paths they replace.
+
+    python -m benchmarks.bench_kernels
+"""
+from __future__ import annotations
+
+import time
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+import numpy as np
+
+from app.kernels import exact_pow, iroot, modpow_array, real_root, root_array
+
+
+def bench(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def report(name: str, generic: float, kernel: float) -> None:
+    print(f"{name:<42} generic {generic * 1e3:9.3f} ms   kernel {kernel * 1e3:9.3f} ms   x{generic / kernel:7.1f}")
+
+
+def main() -> None:
+    # exact integer power: the float path overflows, so the generic exact
+    # alternative is Fraction arithmetic
+    report(
+        "pow 7 ** 1200 exact (vs Fraction)",
+        bench(lambda: [Fraction(7) ** 1200 for _ in range(200)]),
+        bench(lambda: [exact_pow(7.0, 1200.0) for _ in range(200)]),
+    )
+
+    # exact integer root of a large perfect power (vs Decimal at 60 digits)
+    n = 123456789 ** 5
+
+    def decimal_root():
+        with localcontext() as ctx:
+            ctx.prec = 60
+            return Decimal(n) ** (Decimal(1) / 5)
+
+    report(
+        "iroot(123456789**5, 5) (vs Decimal prec=60)",
+        bench(lambda: [decimal_root() for _ in range(2000)]),
+        bench(lambda: [iroot(n, 5) for _ in range(2000)]),
+    )
+
+    # vectorized odd cube roots over 1M elements (vs per-element scalar path)
+    a = -np.random.default_rng(0).random(1_000_000) * 1e6
+    small = a[:20_000]
+    per_elem = bench(lambda: [real_root(x, 3.0) for x in small], repeat=3) * (a.size / small.size)
+    report("root_array 1M cube roots (vs scalar loop)", per_elem, bench(lambda: root_array(a, 3.0)))
+
+    # vectorized modular power (vs per-element pow(a, b, m))
+    base = np.arange(1_000_000, dtype=np.int64)
+    exp = np.full(base.size, 65537, dtype=np.int64)
+    m = 2 ** 31 - 1
+    report(
+        "modpow_array 1M x ^65537 mod 2^31-1",
+        bench(lambda: [pow(int(x), 65537, m) for x in base[:100_000]], repeat=3) * 10,
+        bench(lambda: modpow_array(base, exp, m), repeat=3),
+    )
+
+
+if __name__ == "__main__":
+    main()
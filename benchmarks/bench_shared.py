@@ -0,0 +1,60 @@
+"""
+Shared-memory history vs private CSV loads.
+
+    python -m benchmarks.bench_shared [rows]
+
+Publishes a synthetic history once and compares what each additional
+process pays to see it: parsing the CSV into a private DataFrame
+(Calculator.load) versus attaching a SharedHistoryReader and taking its
+zero-copy columns, or materializing the full DataFrame.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from app.history import History
+from app.history_shm import SharedHistoryPublisher, SharedHistoryReader
+from benchmarks.bench_storage import build_history
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    history = build_history(rows)
+    publisher = SharedHistoryPublisher(f"b{uuid.uuid4().hex[:8]}")
+    try:
+        publish = timed(lambda: publisher.publish(history))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "h.csv")
+            history.to_csv(path)
+            load_csv = timed(lambda: History().from_csv(path))
+
+        def attach_columns() -> None:
+            reader = SharedHistoryReader(publisher.name)
+            reader.columns().result.sum()
+            reader.close()
+
+        def attach_df() -> None:
+            reader = SharedHistoryReader(publisher.name)
+            reader.df
+            reader.close()
+
+        print(f"publish once          {publish:6.3f}s")
+        print(f"per process: csv load {load_csv:6.3f}s")
+        print(f"per process: attach   {timed(attach_columns):6.3f}s  (zero-copy columns)")
+        print(f"per process: attach   {timed(attach_df):6.3f}s  (DataFrame with strings)")
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+History storage: CSV vs the block-compressed binary format.
+
+    python -m benchmarks.bench_storage [rows]
+
+Saves a synthetic history (mixed operations, one timestamp per row) both
+ways and reports file size, save time, full load time, and the time to load
+a narrow time window, which the binary loader serves by skipping blocks.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.history import History
+
+OPS = np.array(["add", "sub", "mul", "div", "pow", "root"], dtype=object)
+
+
+def build_history(rows: int) -> History:
+    rng = np.random.default_rng(0)
+    stamps = pd.date_range("2024-01-01", periods=rows, freq="37ms", tz="UTC")
+    a = rng.random(rows) * 100
+    b = rng.random(rows) * 10
+    h = History()
+    h.restore(
+        pd.DataFrame(
+            {
+                "timestamp_utc": [t.isoformat() for t in stamps],
+                "a": a,
+                "b": b,
+                "operation": OPS[rng.integers(0, len(OPS), rows)],
+                "result": a * b,
+            },
+            dtype=object,
+        )
+    )
+    return h
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    history = build_history(rows)
+    ts = history.df["timestamp_utc"]
+    since, until = ts.iloc[rows // 2], ts.iloc[rows // 2 + rows // 100]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, bin_path = os.path.join(tmp, "h.csv"), os.path.join(tmp, "h.chb")
+        save_csv = timed(lambda: history.to_csv(csv_path))
+        save_bin = timed(lambda: history.to_binary(bin_path))
+        load_csv = timed(lambda: History().from_csv(csv_path))
+        load_bin = timed(lambda: History().from_binary(bin_path))
+        window = timed(lambda: History().from_binary(bin_path, since=since, until=until))
+        for name, path, save, load in (
+            ("csv", csv_path, save_csv, load_csv),
+            ("binary", bin_path, save_bin, load_bin),
+        ):
+            print(f"{name:<7} {os.path.getsize(path) / 1e6:8.1f} MB  save {save:6.2f}s  load {load:6.2f}s")
+        print(f"binary 1% time window load {window:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
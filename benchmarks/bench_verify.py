@@ -0,0 +1,77 @@
+"""
+History verification: vectorized per-operation replay vs row-by-row execute.
+
+    python -m benchmarks.bench_verify [rows]
+
+Builds a consistent synthetic history (every result recomputed with the
+scalar strategies), saves it as CSV and binary, and times verify_history,
+verify_file on both files, and the row-by-row OperationFactory loop the
+verifier replaces (measured on a 1% sample and scaled).
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.history import History
+from app.history_verify import verify_file, verify_history
+from app.operations import OperationFactory
+
+OPS = ["add", "sub", "mul", "div", "pow", "root"]
+
+
+def build_history(rows: int) -> History:
+    rng = np.random.default_rng(0)
+    ops = np.array(OPS, dtype=object)[rng.integers(0, len(OPS), rows)]
+    a = rng.random(rows) * 100 + 1
+    b = rng.random(rows) * 4 + 1
+    result = np.empty(rows)
+    for name in OPS:
+        mask = ops == name
+        result[mask] = OperationFactory.create(name).execute_array(a[mask], b[mask])
+    h = History()
+    h.add_many("2024-01-01T00:00:00+00:00", a, b, "add", result)
+    h.restore(h.df.assign(operation=ops))
+    return h
+
+
+def row_by_row(df: pd.DataFrame) -> int:
+    bad = 0
+    for op, a, b, r in zip(df["operation"], df["a"], df["b"], df["result"]):
+        if abs(OperationFactory.create(op).execute(a, b) - r) > 1e-9 * abs(r):
+            bad += 1
+    return bad
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    history = build_history(rows)
+    sample = history.df.iloc[: max(1, rows // 100)]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, bin_path = os.path.join(tmp, "h.csv"), os.path.join(tmp, "h.chb")
+        history.to_csv(csv_path)
+        history.to_binary(bin_path)
+        for name, fn in (
+            ("verify_history", lambda: verify_history(history)),
+            ("verify_file csv", lambda: verify_file(csv_path)),
+            ("verify_file chb", lambda: verify_file(bin_path)),
+        ):
+            elapsed, report = timed(fn)
+            print(f"{name:<16} {elapsed:6.2f}s  {report.mismatch_count} mismatches")
+    elapsed, _ = timed(lambda: row_by_row(sample))
+    print(f"{'row-by-row':<16} {elapsed * rows / len(sample):6.2f}s  (scaled from {len(sample)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import pytest
+
+from app.history import History
+
+
+@pytest.fixture
+def make_history():
+    """Factory for a History of one-row batches.
+
+    By default row i is ``i * 2.0 = i * 2`` stamped ``00:00:<i>.5`` UTC; ``op`` may
+    be a list of operations to cycle through. ``rows`` gives explicit
+    ``(operation, a, b, result)`` tuples instead. Extra keyword arguments go to
+    ``History`` (memory_budget, spill_dir, ...).
+    """
+
+    def make(n=5, *, start=0, op="mul", rows=None, **kwargs):
+        ops = [op] if isinstance(op, str) else list(op)
+        if rows is None:
+            rows = [(ops[i % len(ops)], float(i), 2.0, i * 2.0) for i in range(start, start + n)]
+        h = History(**kwargs)
+        for i, (operation, a, b, result) in enumerate(rows, start):
+            h.add_many(f"2024-01-01T00:00:{i % 60:02d}.500000+00:00", [a], [b], operation, [result])
+        return h
+
+    return make
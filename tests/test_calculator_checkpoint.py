@@ -0,0 +1,105 @@
+import mmap
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.calculator_memento import CalculatorMemento
+from app.calculator_checkpoint import CheckpointState, read_checkpoint, write_checkpoint
+from app.exceptions import CheckpointError
+
+
+def test_checkpoint_roundtrip_with_numeric_buffers(tmp_path):
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "operation": ["add", "mul", "div"]})
+    undo = [CalculatorMemento(history_df=df.iloc[:1]), CalculatorMemento(history_df=df.iloc[:2])]
+    p = tmp_path / "s.ckpt"
+
+    state = CheckpointState(
+        history=CalculatorMemento(history_df=df), undo=undo, redo=[], chunks={"c0": df}
+    )
+    write_checkpoint(str(p), state)
+    state = read_checkpoint(str(p))
+
+    assert state.history.history_df.equals(df)
+    assert len(state.undo) == 2
+    assert state.undo[1].history_df.equals(df.iloc[:2])
+    assert state.redo == []
+    assert state.chunks["c0"].equals(df)
+
+
+def _mapped(arr: np.ndarray) -> bool:
+    base = arr
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, memoryview) and isinstance(base.obj, mmap.mmap)
+
+
+def test_checkpoint_numeric_columns_are_backed_by_the_mapping(tmp_path):
+    # History keeps object columns; float/int cells must still go out-of-band
+    df = pd.DataFrame(
+        {
+            "timestamp_utc": ["t0", "t0", "t1"],
+            "a": [1.0, 2.5, float("nan")],
+            "b": [1, 2, 3],
+            "operation": ["add", "mul", "add"],
+            "result": [1.0, 5.0, 4.0],
+        },
+        dtype=object,
+    )
+    p = tmp_path / "s.ckpt"
+    write_checkpoint(str(p), CheckpointState(history=CalculatorMemento(history_df=df), undo=[], redo=[], chunks={}))
+    restored = read_checkpoint(str(p)).history.history_df
+
+    for col in ("a", "b", "result"):
+        values = restored[col].to_numpy()
+        assert values.dtype != object
+        assert _mapped(values)
+        assert not values.flags.writeable
+    assert restored["b"].tolist() == [1, 2, 3]
+    assert restored["timestamp_utc"].tolist() == ["t0", "t0", "t1"]
+    assert restored["operation"].tolist() == ["add", "mul", "add"]
+    assert np.isnan(restored["a"].iloc[2])
+
+
+def test_checkpoint_keeps_non_native_values_exact(tmp_path):
+    df = pd.DataFrame(
+        {
+            "big": [2**70, 3],
+            "mixed": pd.Series([1, 2.5], dtype=object, index=[5, 6]),
+            "dec": [Decimal("0.1"), Decimal("2")],
+            "text": ["x", None],
+            "s": pd.Series(["p", "q"], dtype="str", index=[5, 6]),
+        },
+        index=[5, 6],
+    )
+    p = tmp_path / "s.ckpt"
+    write_checkpoint(str(p), CheckpointState(history=CalculatorMemento(history_df=df), undo=[], redo=[], chunks={}))
+    restored = read_checkpoint(str(p)).history.history_df
+
+    assert restored.equals(df)
+    assert restored["big"].iloc[0] == 2**70
+    assert type(restored["mixed"].iloc[0]) is int
+    assert restored["dec"].iloc[0] == Decimal("0.1")
+    assert restored.index.tolist() == [5, 6]
+    assert restored["s"].dtype == df["s"].dtype
+
+
+def test_checkpoint_bad_magic(tmp_path):
+    p = tmp_path / "bad.ckpt"
+    p.write_bytes(b"not a checkpoint at all")
+    with pytest.raises(CheckpointError):
+        read_checkpoint(str(p))
+
+
+def test_checkpoint_missing_file(tmp_path):
+    with pytest.raises(CheckpointError):
+        read_checkpoint(str(tmp_path / "missing.ckpt"))
+
+
+def test_checkpoint_write_failure(tmp_path):
+    state = CheckpointState(
+        history=CalculatorMemento(history_df=pd.DataFrame()), undo=[], redo=[], chunks={}
+    )
+    with pytest.raises(CheckpointError):
+        write_checkpoint(str(tmp_path / "no" / "such" / "dir.ckpt"), state)
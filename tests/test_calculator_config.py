@@ -6,9 +6,11 @@ from app.exceptions import ConfigError
 def test_config_defaults(monkeypatch):
     monkeypatch.delenv("CALC_HISTORY_FILE", raising=False)
     monkeypatch.delenv("CALC_AUTOSAVE", raising=False)
+    monkeypatch.delenv("CALC_CHECKPOINT_FILE", raising=False)
     cfg = CalculatorConfig.load()
     assert cfg.history_file == "calc_history.csv"
     assert cfg.autosave is True
+    assert cfg.checkpoint_file == "calc_session.ckpt"
 
 @pytest.mark.parametrize("val,expected", [("true", True), ("false", False), ("1", True), ("0", False), ("yes", True), ("no", False)])
 def test_config_autosave_variants(monkeypatch, val, expected):
@@ -27,4 +29,62 @@ def test_config_bad_autosave(monkeypatch):
     monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
     monkeypatch.setenv("CALC_AUTOSAVE", "maybe")
     with pytest.raises(ConfigError):
-        CalculatorConfig.load()
\ No newline at end of file
+        CalculatorConfig.load()
+
+def test_config_empty_checkpoint_file(monkeypatch):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv("CALC_CHECKPOINT_FILE", " ")
+    with pytest.raises(ConfigError):
+        CalculatorConfig.load()
+
+
+def test_config_history_memory_budget(monkeypatch):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv("CALC_HISTORY_MEMORY_BUDGET", "1048576")
+    assert CalculatorConfig.load().history_memory_budget == 1048576
+
+
+@pytest.mark.parametrize("val", ["lots", "-1"])
+def test_config_bad_history_memory_budget(monkeypatch, val):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv("CALC_HISTORY_MEMORY_BUDGET", val)
+    with pytest.raises(ConfigError):
+        CalculatorConfig.load()
+
+
+def test_config_precision(monkeypatch):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv("CALC_PRECISION", "34")
+    assert CalculatorConfig.load().precision == 34
+
+
+@pytest.mark.parametrize("val", ["high", "-2"])
+def test_config_bad_precision(monkeypatch, val):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv("CALC_PRECISION", val)
+    with pytest.raises(ConfigError):
+        CalculatorConfig.load()
+
+
+def test_config_memory_budgets(monkeypatch):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv("CALC_UNDO_MEMORY_BUDGET", "2048")
+    monkeypatch.setenv("CALC_MEMORY_WARN_BYTES", "4096")
+    cfg = CalculatorConfig.load()
+    assert (cfg.undo_memory_budget, cfg.memory_warn_bytes) == (2048, 4096)
+
+
+@pytest.mark.parametrize("var", ["CALC_UNDO_MEMORY_BUDGET", "CALC_MEMORY_WARN_BYTES"])
+@pytest.mark.parametrize("val", ["big", "-5"])
+def test_config_bad_memory_budgets(monkeypatch, var, val):
+    monkeypatch.setenv("CALC_HISTORY_FILE", "x.csv")
+    monkeypatch.setenv("CALC_AUTOSAVE", "true")
+    monkeypatch.setenv(var, val)
+    with pytest.raises(ConfigError):
+        CalculatorConfig.load()
@@ -1,11 +1,16 @@
+import numpy as np
 import pytest
 
-from app.calculator_repl import Calculator, process_line, run_repl, LoggingObserver
+from app.calculator_repl import Calculator, process_line, run_dataset_command, run_repl, LoggingObserver
 from app.calculator_config import CalculatorConfig
 from app.history import History
 
 def make_calc(tmp_path, autosave=False):
-    cfg = CalculatorConfig(history_file=str(tmp_path / "hist.csv"), autosave=autosave)
+    cfg = CalculatorConfig(
+        history_file=str(tmp_path / "hist.csv"),
+        autosave=autosave,
+        checkpoint_file=str(tmp_path / "session.ckpt"),
+    )
     return Calculator(config=cfg, history=History())
 
 @pytest.mark.parametrize(
@@ -64,6 +69,22 @@ def test_logging_observer_called(tmp_path):
     process_line(calc, "add 2 2")
     assert any("add(2.0, 2.0)" in s for s in logs)
 
+def test_calculate_many_undo_and_observers(tmp_path):
+    logs = []
+    calc = make_calc(tmp_path, autosave=True)
+    calc.add_observer(LoggingObserver(logs.append))
+    batch = calc.calculate_many("div", [1.0, 2.0], 0.0)
+    assert len(batch.errors) == 2
+    assert len(calc.history) == 0
+    assert not calc.undo(), "a batch that appends nothing records no undo entry"
+    assert not (tmp_path / "hist.csv").exists()
+
+    calc.calculate_many("div", [1.0, 2.0, 3.0], [1.0, 0.0, 2.0])
+    assert logs == ["[LOG] batch:div(2.0, 2.0) = 0.0", "[LOG] batch:div(3.0, 1.0) = 2.0"]
+    assert calc.history.df["result"].tolist() == [1.0, 1.5]
+    assert calc.undo()
+    assert len(calc.history) == 0
+
 def test_run_repl_smoke(tmp_path):
     calc = make_calc(tmp_path, autosave=False)
     inputs = iter(["add 1 1", "exit"])
@@ -217,4 +238,382 @@ def test_exit_command_branch_counts(tmp_path):
     calc = make_calc(tmp_path)
 
     assert is_command("exit") is True  # ensures it enters the command block
-    assert process_line(calc, "exit") == "EXIT"
\ No newline at end of file
+    assert process_line(calc, "exit") == "EXIT"
+
+def test_checkpoint_resume_restores_undo_redo(tmp_path):
+    calc = make_calc(tmp_path)
+    process_line(calc, "add 1 2")
+    process_line(calc, "mul 2 3")
+    process_line(calc, "undo")
+    assert process_line(calc, "checkpoint") == "Checkpointed."
+
+    calc2 = make_calc(tmp_path)
+    assert process_line(calc2, "resume") == "Resumed."
+    assert process_line(calc2, "history") == process_line(calc, "history")
+
+    assert process_line(calc2, "redo") == "Redone."
+    assert "mul" in process_line(calc2, "history")
+    assert process_line(calc2, "undo") == "Undone."
+    assert process_line(calc2, "undo") == "Undone."
+    assert process_line(calc2, "history") == "(history is empty)"
+
+    # resumed state keeps working
+    assert process_line(calc2, "add 2 2") == "4.0"
+
+
+def test_resume_without_checkpoint_raises(tmp_path):
+    from app.exceptions import CheckpointError
+
+    calc = make_calc(tmp_path)
+    with pytest.raises(CheckpointError):
+        process_line(calc, "resume")
+
+
+def test_resume_refuses_checkpoint_older_than_history(tmp_path):
+    import os
+
+    from app.exceptions import CheckpointError
+
+    calc = make_calc(tmp_path, autosave=True)
+    calc.calculate("add", 1, 2)
+    calc.checkpoint()
+    calc.calculate("mul", 2, 3)  # autosaved after the checkpoint, then "crash"
+    ckpt = tmp_path / "session.ckpt"
+    os.utime(ckpt, ns=(1, 1))
+
+    calc2 = make_calc(tmp_path)
+    with pytest.raises(CheckpointError, match="older than"):
+        calc2.resume(require_current=True)
+    calc2.load()
+    assert len(calc2.history) == 2
+
+    # an explicit resume still restores the older session
+    calc2.resume()
+    assert len(calc2.history) == 1
+
+    os.utime(ckpt)
+    calc2.resume(require_current=True)
+    assert len(calc2.history) == 1
+
+
+def test_resume_require_current_without_history_file(tmp_path):
+    calc = make_calc(tmp_path)
+    calc.calculate("add", 1, 2)
+    calc.checkpoint()
+    calc2 = make_calc(tmp_path)
+    calc2.resume(require_current=True)
+    assert len(calc2.history) == 1
+
+
+def test_process_line_vector_operands(tmp_path):
+    calc = make_calc(tmp_path)
+    out = process_line(calc, "mul [1,2,3,4] 2.5")
+    assert out.splitlines()[0] == "4 elements, 4 ok, 0 errors"
+    assert "max=10.0" in out
+    assert len(calc.history.df) == 4
+
+    # the whole batch is one undo step
+    assert process_line(calc, "undo") == "Undone."
+    assert process_line(calc, "history") == "(history is empty)"
+
+
+def test_process_line_vector_domain_errors(tmp_path):
+    calc = make_calc(tmp_path, autosave=True)
+    out = process_line(calc, "div [1, 2, 3] [1, 0, 3]")
+    assert "3 elements, 2 ok, 1 errors" in out
+    assert "[1] 2.0, 0.0: Cannot divide by zero." in out
+    assert len(calc.history.df) == 2
+
+
+def test_process_line_vector_all_errors_truncated(tmp_path):
+    calc = make_calc(tmp_path)
+    out = process_line(calc, "div range(7) 0")
+    assert "7 elements, 0 ok, 7 errors" in out
+    assert "min=" not in out
+    assert "... 2 more errors" in out
+    assert calc.history.df.empty
+
+
+def test_process_line_dataset_records_summary(tmp_path):
+    import pandas as pd
+
+    src = tmp_path / "data.csv"
+    out = tmp_path / "out.csv"
+    pd.DataFrame({"x": [6.0, 1.0], "y": [3.0, 0.0]}).to_csv(src, index=False)
+
+    calc = make_calc(tmp_path, autosave=True)
+    msg = process_line(calc, f"dataset div {src} {out} x y")
+    assert msg.startswith("div: 2 rows in 1 chunks, 1 errors")
+
+    row = calc.history.df.iloc[-1]
+    assert row["operation"] == "dataset:div"
+    assert (row["a"], row["b"], row["result"]) == (2, 1, 1)
+    assert process_line(calc, "undo") == "Undone."
+    assert calc.history.df.empty
+
+
+def test_run_dataset_record_flag(tmp_path):
+    import pandas as pd
+
+    src = tmp_path / "data.csv"
+    pd.DataFrame({"x": [1.0], "y": [2.0]}).to_csv(src, index=False)
+    calc = make_calc(tmp_path)
+    summary = calc.run_dataset(["add", "mul"], str(src), str(tmp_path / "o.csv"), ["x", "y", "2"])
+    assert summary.rows == 1
+    assert calc.history.df.empty
+
+    calc.run_dataset(["add"], str(src), str(tmp_path / "o.csv"), ["x", "y"], record=True)
+    assert calc.history.df.iloc[0]["operation"] == "dataset:add"
+
+
+def test_run_dataset_command_leaves_history_file(tmp_path):
+    import pandas as pd
+
+    data_dir = tmp_path / "my data"
+    data_dir.mkdir()
+    src, out = data_dir / "in.csv", data_dir / "out.csv"
+    pd.DataFrame({"x": [6.0], "y": [3.0]}).to_csv(src, index=False)
+    calc = make_calc(tmp_path, autosave=True)
+    calc.calculate("add", 1, 2)
+    before = (tmp_path / "hist.csv").read_text()
+
+    fresh = Calculator(config=calc.config, history=History())
+    msg = run_dataset_command(fresh, ["dataset", "div", str(src), str(out), "x", "y"])
+    assert msg.startswith("div: 1 rows")
+    assert pd.read_csv(out)["result"].tolist() == [2.0]
+    assert (tmp_path / "hist.csv").read_text() == before
+    assert fresh.history.df.empty
+
+
+def test_process_line_dataset_usage_error(tmp_path):
+    from app.exceptions import InvalidInputError
+
+    calc = make_calc(tmp_path)
+    with pytest.raises(InvalidInputError):
+        process_line(calc, "dataset div in.csv")
+
+
+def make_spilling_calc(tmp_path):
+    cfg = CalculatorConfig(
+        history_file=str(tmp_path / "hist.csv"),
+        autosave=False,
+        checkpoint_file=str(tmp_path / "session.ckpt"),
+    )
+    return Calculator(config=cfg, history=History(memory_budget=3_000))
+
+
+def test_undo_redo_with_spilled_history(tmp_path):
+    calc = make_spilling_calc(tmp_path)
+    for i in range(60):
+        process_line(calc, f"add {i} 1")
+    assert calc.history.spilled
+    before = process_line(calc, "history")
+
+    process_line(calc, "clear")
+    assert process_line(calc, "history") == "(history is empty)"
+    process_line(calc, "undo")
+    assert process_line(calc, "history") == before
+    process_line(calc, "redo")
+    assert len(calc.history) == 0
+
+
+def test_checkpoint_resume_with_spilled_history(tmp_path):
+    calc = make_spilling_calc(tmp_path)
+    for i in range(60):
+        process_line(calc, f"mul {i} 2")
+    assert calc.history.spilled
+    expected = process_line(calc, "history")
+    process_line(calc, "checkpoint")
+
+    calc2 = make_spilling_calc(tmp_path)
+    process_line(calc2, "resume")
+    assert process_line(calc2, "history") == expected
+    assert calc2.history.spilled[0].path != calc.history.spilled[0].path
+    process_line(calc2, "undo")
+    assert len(calc2.history) == 59
+
+
+def test_precision_command(tmp_path):
+    calc = make_calc(tmp_path)
+    assert "off" in process_line(calc, "precision")
+
+    cfg = CalculatorConfig(
+        history_file=str(tmp_path / "hist.csv"), autosave=False, precision=28
+    )
+    calc = Calculator(config=cfg, history=History())
+    assert process_line(calc, "add 0.1 0.2") == "0.3"
+    assert process_line(calc, "add 1 2") == "3.0"
+    assert process_line(calc, "precision").startswith("evaluations=2 escalations=1")
+
+
+def test_process_line_export(tmp_path):
+    calc = make_calc(tmp_path)
+    process_line(calc, "mul [1,2,3] 2")
+    out = tmp_path / "h.data"
+    assert process_line(calc, f"export {out} csv gzip") == f"Exported 3 rows as csv (gzip) -> {out}"
+    assert process_line(calc, f"export {tmp_path / 'h.jsonl'}").startswith("Exported 3 rows as jsonl (none)")
+
+    from app.exceptions import InvalidInputError
+    with pytest.raises(InvalidInputError):
+        process_line(calc, "export")
+
+
+def test_process_line_verify(tmp_path):
+    calc = make_calc(tmp_path)
+    process_line(calc, "add 2 3")
+    process_line(calc, "root [27,16] [3,2]")
+    assert process_line(calc, "verify").startswith("3 rows, 3 checked, 0 mismatches")
+
+    calc.history.restore(calc.history.df.assign(result=[5.0, 3.0, 4.5]))
+    calc.save()
+    out = process_line(calc, f"verify {calc.config.history_file} 0.05")
+    assert "1 mismatches" in out
+    assert "[2] root 16.0 2.0: stored 4.5, expected 4.0" in out
+    assert process_line(calc, "verify 0.2 0.5").startswith("3 rows, 3 checked, 0 mismatches")
+
+    from app.exceptions import InvalidInputError
+    with pytest.raises(InvalidInputError):
+        process_line(calc, "verify 1 2 3")
+    with pytest.raises(InvalidInputError):
+        process_line(calc, "verify h.csv tight")
+
+
+def test_process_line_memory(tmp_path):
+    calc = make_calc(tmp_path)
+    calc.add_observer(LoggingObserver(lambda s: None))
+    process_line(calc, "mul range(0,1000) 2")
+    out = process_line(calc, "memory")
+    assert out.startswith("accounted")
+    assert "undo" in out and "observers" in out
+    assert "evicted" not in out
+
+    assert process_line(calc, "memory trace on") == "Tracing allocations."
+    try:
+        assert "traced" in process_line(calc, "memory")
+    finally:
+        assert process_line(calc, "memory trace off") == "Tracing stopped."
+
+    from app.exceptions import InvalidInputError
+    with pytest.raises(InvalidInputError):
+        process_line(calc, "memory trace")
+
+
+def test_undo_memory_budget_evicts_oldest(tmp_path):
+    cfg = CalculatorConfig(
+        history_file=str(tmp_path / "hist.csv"),
+        autosave=False,
+        checkpoint_file=str(tmp_path / "session.ckpt"),
+        undo_memory_budget=60_000,
+    )
+    calc = Calculator(config=cfg, history=History())
+    for _ in range(6):
+        # appends snapshot only a row count; each clear keeps its 500 rows
+        calc.calculate_many("add", np.arange(500.0), 1.0)
+        calc.clear()
+    assert calc.undo_evictions > 0
+    report = calc.memory_report()
+    assert report.subsystems["undo"] + report.subsystems["redo"] <= 60_000
+    assert report.undo_entries == 12 - calc.undo_evictions
+    assert "undo entries evicted" in process_line(calc, "memory")
+
+    # redo pushes onto the undo stack and is held to the same budget
+    while calc.undo():
+        pass
+    before = calc.undo_evictions
+    while calc.redo():
+        pass
+    assert calc.undo_evictions >= before
+    assert len(calc.history) == 0
+
+
+def test_append_snapshots_hold_no_rows(tmp_path):
+    calc = make_spilling_calc(tmp_path)
+    for i in range(300):
+        calc.calculate("add", i, 1)
+    assert calc.history.spilled
+    assert calc.memory_report().subsystems["undo"] == 0
+
+    # undo cuts inside the window, then inside and at the end of spilled chunks
+    for remaining in range(299, -1, -1):
+        assert calc.undo()
+        assert calc.history.df["a"].tolist() == list(range(remaining))
+    assert not calc.undo()
+    while calc.redo():
+        pass
+    assert len(calc.history) == 300
+    assert calc.history.df["a"].tolist() == list(range(300))
+
+
+def test_memory_warn_bytes(tmp_path):
+    cfg = CalculatorConfig(
+        history_file=str(tmp_path / "hist.csv"),
+        autosave=False,
+        checkpoint_file=str(tmp_path / "session.ckpt"),
+        memory_warn_bytes=10_000,
+    )
+    calc = Calculator(config=cfg, history=History())
+    from app.memory import MemoryBudgetWarning
+    calc.calculate_many("add", np.arange(500.0), 1.0)
+    with pytest.warns(MemoryBudgetWarning, match="CALC_MEMORY_WARN_BYTES=10000"):
+        calc.calculate("add", 1, 2)
+
+
+def test_memory_warn_check_uses_running_totals(tmp_path, monkeypatch):
+    import tracemalloc
+
+    from app.memory import MemoryBudgetWarning
+
+    cfg = CalculatorConfig(
+        history_file=str(tmp_path / "hist.csv"),
+        autosave=False,
+        checkpoint_file=str(tmp_path / "session.ckpt"),
+        memory_warn_bytes=10_000,
+    )
+    calc = Calculator(config=cfg, history=History())
+    calc.calculate_many("add", np.arange(500.0), 1.0)
+
+    def no_report():
+        raise AssertionError("memory_report() on the calculation path")
+
+    monkeypatch.setattr(calc, "memory_report", no_report)
+    monkeypatch.setattr(tracemalloc, "take_snapshot", no_report)
+    tracemalloc.start()
+    try:
+        with pytest.warns(MemoryBudgetWarning):
+            calc.calculate("add", 1, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def test_process_line_shared(tmp_path):
+    import uuid
+    from app.history_shm import SharedHistoryPublisher
+
+    calc = make_calc(tmp_path)
+    process_line(calc, "add 1 1")
+    assert process_line(calc, "shared") == "Not attached (shared <name>)."
+
+    src = History()
+    src.add_many("2024-01-01T00:00:00+00:00", [2.0, 3.0], [4.0, 5.0], "mul", [8.0, 15.0])
+    publisher = SharedHistoryPublisher(f"r{uuid.uuid4().hex[:8]}")
+    try:
+        publisher.publish(src)
+        out = process_line(calc, f"shared {publisher.name}")
+        assert out.startswith(f"Attached to {publisher.name}: 2 rows")
+        assert process_line(calc, "history") == "mul 2.0 4.0 = 8.0\nmul 3.0 5.0 = 15.0"
+
+        publisher.append(src.df.iloc[:1])
+        assert process_line(calc, "shared").endswith("+1 since last refresh)")
+        assert len(process_line(calc, "history").splitlines()) == 3
+
+        # re-attaching replaces the previous reader
+        process_line(calc, f"shared {publisher.name}")
+        assert process_line(calc, "shared off") == "Detached."
+        assert process_line(calc, "history") == "add 1.0 1.0 = 2.0"
+        calc.detach_shared()
+    finally:
+        publisher.close()
+
+    from app.exceptions import InvalidInputError
+    with pytest.raises(InvalidInputError):
+        process_line(calc, "shared a b")
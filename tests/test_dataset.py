@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from app.dataset import apply_to_columns, compile_chain
+from app.exceptions import DatasetError, InvalidInputError, OperationNotFoundError
+
+
+def write_csv(path, **cols):
+    pd.DataFrame(cols).to_csv(path, index=False)
+    return str(path)
+
+
+def test_apply_div_in_chunks(tmp_path):
+    src = write_csv(tmp_path / "in.csv", x=[1.0, 4.0, 9.0, 8.0, 5.0], y=[1.0, 2.0, 3.0, 0.0, 5.0], z=["a"] * 5)
+    out = tmp_path / "out.csv"
+
+    summary = apply_to_columns(src, str(out), ["div"], ["x", "y"], chunksize=2)
+
+    assert (summary.rows, summary.errors, summary.chunks, summary.chain) == (5, 1, 3, "div")
+    res = pd.read_csv(out)
+    assert list(res.columns) == ["result"]
+    assert res["result"].tolist()[:3] == [1.0, 2.0, 3.0]
+    assert pd.isna(res["result"][3])  # division by zero -> empty cell
+
+
+def test_apply_chain_with_constant(tmp_path):
+    src = write_csv(tmp_path / "in.csv", x=[2.0, 6.0], y=[1.0, 3.0])
+    out = tmp_path / "out.csv"
+
+    summary = apply_to_columns(src, str(out), ["div", "mul", "add"], ["x", "y", "100", "x"])
+
+    assert summary.chain == "div,mul,add"
+    assert pd.read_csv(out)["result"].tolist() == [202.0, 206.0]
+
+
+def test_apply_empty_input_writes_header(tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text("x,y\n")
+    out = tmp_path / "out.csv"
+    summary = apply_to_columns(str(src), str(out), ["add"], ["x", "y"])
+    assert summary.rows == 0
+    assert out.read_text().strip() == "result"
+
+
+@pytest.mark.parametrize(
+    "ops,sources,exc",
+    [
+        ([], ["x"], InvalidInputError),
+        (["add"], ["x"], InvalidInputError),
+        (["add"], ["x", "nope"], InvalidInputError),
+        (["add"], ["1", "2"], InvalidInputError),
+        (["bogus"], ["x", "y"], OperationNotFoundError),
+    ],
+)
+def test_compile_chain_invalid(ops, sources, exc):
+    with pytest.raises(exc):
+        compile_chain(ops, sources, ["x", "y"])
+
+
+def test_apply_missing_input(tmp_path):
+    with pytest.raises(DatasetError):
+        apply_to_columns(str(tmp_path / "missing.csv"), str(tmp_path / "o.csv"), ["add"], ["x", "y"])
+
+
+def test_apply_unwritable_output(tmp_path):
+    src = write_csv(tmp_path / "in.csv", x=[1.0], y=[2.0])
+    with pytest.raises(DatasetError):
+        apply_to_columns(src, str(tmp_path / "no" / "dir" / "o.csv"), ["add"], ["x", "y"])
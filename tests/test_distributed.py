@@ -0,0 +1,149 @@
+import json
+import socket
+import socketserver
+import threading
+
+import numpy as np
+import pytest
+
+from app.distributed import Coordinator, Worker, format_stats
+from app.exceptions import DistributedError
+
+
+@pytest.fixture
+def workers():
+    started = [Worker().start() for _ in range(3)]
+    yield started
+    for w in started:
+        w.close()
+
+
+class _FlakyHandler(socketserver.StreamRequestHandler):
+    """Reads one request, then drops the connection without replying."""
+    def handle(self):
+        self.rfile.readline()
+
+
+class _RejectingHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        msg = json.loads(self.rfile.readline())
+        self.wfile.write(json.dumps({"id": msg["id"], "error": "nope"}).encode() + b"\n")
+
+
+class _MalformedHandler(socketserver.StreamRequestHandler):
+    """Answers every request with a reply the coordinator cannot use."""
+    replies = [{}, {"result": [1.0], "errors": []}, {"result": [1.0, 2.0], "errors": {}},
+               {"result": [1.0], "errors": {"5": "x"}}]
+
+    def handle(self):
+        for i, _ in enumerate(self.rfile):
+            reply = self.replies[i % len(self.replies)]
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+def fake_worker(handler):
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def dead_address():
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    addr = s.getsockname()
+    s.close()
+    return addr
+
+
+def test_distributed_matches_local_in_order(workers):
+    a = np.arange(1, 10_001, dtype=float)
+    coord = Coordinator([w.address for w in workers], chunk_size=777)
+    out = coord.run("pow", a, 2)
+
+    assert np.array_equal(out.result, a ** 2)
+    assert out.errors == {}
+    assert sum(s.elements for s in out.stats) == a.size
+    assert all(s.throughput > 0 for s in out.stats if s.chunks)
+    assert "throughput=" in format_stats(out.stats)
+
+
+def test_distributed_reports_errors_with_global_index(workers):
+    b = np.array([1.0, 2.0, 0.0, 4.0, 0.0])
+    out = Coordinator([w.address for w in workers], chunk_size=2).run("div", 8.0, b)
+    assert out.errors == {2: "Cannot divide by zero.", 4: "Cannot divide by zero."}
+    assert out.result[3] == 2.0
+
+
+def test_lost_chunks_are_retried_and_stolen(workers):
+    flaky = fake_worker(_FlakyHandler)
+    addrs = [flaky.server_address, dead_address(), workers[0].address]
+    a = np.arange(100, dtype=float)
+
+    out = Coordinator(addrs, chunk_size=10).run("add", a, 1)
+
+    assert np.array_equal(out.result, a + 1)
+    assert out.stats[0].failed and out.stats[1].failed
+    assert out.stats[2].stolen > 0
+    assert "FAILED" in format_stats(out.stats)
+    flaky.shutdown()
+
+
+def test_malformed_reply_is_a_lost_worker(workers):
+    bad = fake_worker(_MalformedHandler)
+    a = np.arange(40, dtype=float)
+
+    out = Coordinator([bad.server_address, workers[0].address], chunk_size=1, max_attempts=5).run("add", a, 1)
+
+    assert np.array_equal(out.result, a + 1)
+    assert out.stats[0].failed and out.stats[0].chunks == 0
+    bad.shutdown()
+
+
+@pytest.mark.parametrize("reply", _MalformedHandler.replies)
+def test_malformed_reply_alone_exhausts_attempts(reply, monkeypatch):
+    monkeypatch.setattr(_MalformedHandler, "replies", [reply])
+    bad = fake_worker(_MalformedHandler)
+    with pytest.raises(DistributedError, match="attempts"):
+        Coordinator([bad.server_address] * 2, max_attempts=2).run("add", [1.0], 1)
+    bad.shutdown()
+
+
+def test_all_workers_lost():
+    with pytest.raises(DistributedError, match="All workers failed"):
+        Coordinator([dead_address()]).run("add", [1.0, 2.0], 1)
+
+
+def test_chunk_exhausts_attempts():
+    flaky = fake_worker(_FlakyHandler)
+    with pytest.raises(DistributedError, match="attempts"):
+        Coordinator([flaky.server_address] * 2, max_attempts=1).run("add", [1.0], 1)
+    flaky.shutdown()
+
+
+def test_worker_rejection_is_fatal():
+    server = fake_worker(_RejectingHandler)
+    with pytest.raises(DistributedError, match="nope"):
+        Coordinator([server.server_address]).run("add", [1.0], 1)
+    server.shutdown()
+
+
+def test_worker_replies_with_error_for_bad_request(workers):
+    with socket.create_connection(workers[0].address) as sock:
+        stream = sock.makefile("rwb")
+        stream.write(b'{"id": 7, "op": "bogus", "a": [1], "b": [2]}\n')
+        stream.flush()
+        reply = json.loads(stream.readline())
+    assert reply["id"] == 7 and "Unknown operation" in reply["error"]
+
+
+def test_empty_workload(workers):
+    out = Coordinator([workers[0].address]).run("add", np.array([]), 1)
+    assert out.result.size == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": []}, {"workers": [("h", 1)], "chunk_size": 0}])
+def test_coordinator_invalid_config(kwargs):
+    with pytest.raises(DistributedError):
+        Coordinator(**kwargs)
@@ -5,6 +5,9 @@ from app.exceptions import (
     DivisionByZeroError,
     ConfigError,
     HistoryError,
+    CheckpointError,
+    DatasetError,
+    DistributedError,
 )
 
 def test_exceptions_inherit():
@@ -12,4 +15,7 @@ def test_exceptions_inherit():
     assert issubclass(OperationNotFoundError, CalculatorError)
     assert issubclass(DivisionByZeroError, CalculatorError)
     assert issubclass(ConfigError, CalculatorError)
-    assert issubclass(HistoryError, CalculatorError)
\ No newline at end of file
+    assert issubclass(HistoryError, CalculatorError)
+    assert issubclass(CheckpointError, CalculatorError)
+    assert issubclass(DatasetError, CalculatorError)
+    assert issubclass(DistributedError, CalculatorError)
\ No newline at end of file
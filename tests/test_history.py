@@ -56,4 +56,120 @@ def test_history_load_failure(monkeypatch):
     monkeypatch.setattr(pd, "read_csv", boom)
 
     with pytest.raises(Exception):
-        h.from_csv("x.csv")
\ No newline at end of file
+        h.from_csv("x.csv")
+
+def test_history_add_many_single_append():
+    h = History()
+    h.add_many("2024-01-01T00:00:00+00:00", [1.0, 2.0], [3.0, 4.0], "add", [4.0, 6.0])
+    df = h.df
+    assert len(df) == 2
+    assert df["operation"].tolist() == ["add", "add"]
+    assert df["result"].tolist() == [4.0, 6.0]
+
+    h.add_many("2024-01-01T00:00:00+00:00", [], [], "add", [])
+    assert len(h.df) == 2
+
+
+def test_history_window_bytes_running_total():
+    h = History()
+    assert h.window_bytes == int(h._df.memory_usage(deep=True).sum())
+    h.add_many("2024-01-01T00:00:00+00:00", [1.0, 2.0], [3.0, 4.0], "add", [4.0, 6.0])
+    for i in range(5):
+        h.add(Calculation.from_strategy(i, 2, OperationFactory.create("mul")))
+        assert h.window_bytes == int(h._df.memory_usage(deep=True).sum())
+    h.clear()
+    assert h.window_bytes == int(h._df.memory_usage(deep=True).sum())
+
+    # a float64 window turned object by an exact big-int row is re-measured
+    h = History()
+    h.restore(pd.DataFrame({"timestamp_utc": ["t"], "a": [1.0], "b": [2.0], "operation": ["add"], "result": [3.0]}))
+    h.window_bytes
+    h.add(Calculation.from_strategy(2, 2000, OperationFactory.create("pow")))
+    assert h._df["result"].dtype == object
+    assert h.window_bytes == int(h._df.memory_usage(deep=True).sum())
+
+
+def test_history_spills_past_memory_budget(make_history, tmp_path):
+    h = make_history(200, memory_budget=4_000, spill_dir=str(tmp_path))
+
+    assert h.spilled, "older rows should have been spilled"
+    assert int(h._df.memory_usage(deep=True).sum()) <= 4_000
+    assert len(h) == 200
+    assert h.df["a"].tolist() == [float(i) for i in range(200)]
+    assert sum(len(c) for c in h.iter_chunks()) == 200
+
+
+def test_history_truncate_across_spilled_chunks(make_history, tmp_path):
+    h = make_history(200, memory_budget=4_000, spill_dir=str(tmp_path))
+    chunks = h.spilled
+    boundary = chunks[0].rows + chunks[1].rows
+
+    h.truncate(boundary)
+    assert h.spilled == chunks[:2]
+    assert len(h._df) == 0
+    h.truncate(chunks[0].rows + 3)
+    assert h.spilled == chunks[:1]
+    assert h.df["a"].tolist() == [float(i) for i in range(chunks[0].rows + 3)]
+    h.truncate(0)
+    assert len(h) == 0
+
+
+def test_history_query_and_csv_across_spilled_chunks(make_history, tmp_path):
+    h = make_history(150, memory_budget=4_000, spill_dir=str(tmp_path))
+
+    hits = h.query("a >= 10 and a < 13")
+    assert hits["a"].tolist() == [10.0, 11.0, 12.0]
+
+    p = tmp_path / "hist.csv"
+    h.to_csv(str(p))
+    back = pd.read_csv(p)
+    assert len(back) == 150
+    assert back["a"].tolist()[:3] == [0.0, 1.0, 2.0]
+
+
+def test_history_chunked_load_respects_budget(make_history, tmp_path, monkeypatch):
+    import app.history as history_mod
+
+    p = tmp_path / "hist.csv"
+    make_history(300).to_csv(str(p))
+
+    h = History(memory_budget=4_000, spill_dir=str(tmp_path / "spill"))
+    (tmp_path / "spill").mkdir()
+    monkeypatch.setattr(history_mod, "CSV_CHUNKSIZE", 50)
+    h.from_csv(str(p))
+    assert len(h) == 300
+    assert h.spilled
+    assert h.df["result"].tolist()[-1] == 598.0
+
+
+def test_history_chunked_load_missing_columns(tmp_path):
+    p = tmp_path / "bad.csv"
+    pd.DataFrame([{"x": 1}]).to_csv(p, index=False)
+    h = History(memory_budget=1_000)
+    with pytest.raises(HistoryError):
+        h.from_csv(str(p))
+
+
+def test_history_spill_failure(make_history, tmp_path):
+    with pytest.raises(HistoryError):
+        make_history(50, memory_budget=1_000, spill_dir=str(tmp_path / "missing"))
+
+
+def test_history_default_spill_dir_is_temporary(make_history):
+    h = make_history(100, memory_budget=2_000)
+    spill_dir = os.path.dirname(h.spilled[0].path)
+    assert os.path.isdir(spill_dir)
+    del h
+    import gc
+    gc.collect()
+    assert not os.path.exists(spill_dir)
+
+
+def test_history_add_keeps_exact_big_int_result(tmp_path):
+    h = History()
+    h.add(Calculation.from_strategy(2, 2000, OperationFactory.create("pow")))
+    assert h.df.iloc[0]["result"] == 2 ** 2000
+
+    p = tmp_path / "hist.csv"
+    h.to_csv(str(p))
+    assert str(2 ** 2000) in p.read_text()
@@ -0,0 +1,173 @@
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from app import history_codec
+from app.calculation import Calculation
+from app.exceptions import HistoryError
+from app.history import History
+from app.history_codec import is_history_binary, iter_history_binary, read_index, write_history_binary
+
+OPS = ["add", "sub", "mul", "div", "pow", "root"]
+
+
+def test_binary_roundtrip(make_history, tmp_path):
+    h = make_history(10, op=OPS)
+    p = tmp_path / "h.chb"
+    assert h.to_binary(str(p)) == 10
+    assert is_history_binary(str(p))
+
+    back = History()
+    back.from_binary(str(p))
+    assert back.df["timestamp_utc"].tolist() == h.df["timestamp_utc"].tolist()
+    assert back.df["operation"].tolist() == h.df["operation"].tolist()
+    assert back.df["result"].tolist() == [float(i) * 2 for i in range(10)]
+
+
+def test_binary_blocks_and_index(make_history, tmp_path):
+    p = tmp_path / "h.chb"
+    write_history_binary(str(p), make_history(10, op=OPS).iter_chunks(), block_rows=4)
+    blocks = read_index(str(p))
+    assert [b.rows for b in blocks] == [4, 4, 2]
+    assert blocks[0].operations == ["add", "sub", "mul", "div"]
+    assert blocks[0].ts_min < blocks[0].ts_max < blocks[1].ts_min
+
+
+def test_binary_skips_blocks(make_history, tmp_path, monkeypatch):
+    p = tmp_path / "h.chb"
+    write_history_binary(str(p), make_history(12, op=OPS).iter_chunks(), block_rows=4)
+    decoded = []
+    real = history_codec._decode_block
+    monkeypatch.setattr(history_codec, "_decode_block", lambda blob: decoded.append(1) or real(blob))
+
+    frames = list(iter_history_binary(str(p), since="2024-01-01T00:00:05", until="2024-01-01T00:00:06+00:00"))
+    assert len(decoded) == 1
+    assert pd.concat(frames)["a"].tolist() == [5.0]
+
+    decoded.clear()
+    frames = list(iter_history_binary(str(p), operations=["root"]))
+    # "root" sits in rows 5 and 11: the first block's dictionary rules it out
+    assert len(decoded) == 2
+    assert pd.concat(frames)["a"].tolist() == [5.0, 11.0]
+
+    assert len(pd.concat(iter_history_binary(str(p), since="2024-01-01T00:00:10"))) == 2
+    assert len(pd.concat(iter_history_binary(str(p), until="2024-01-01T00:00:01"))) == 1
+    assert list(iter_history_binary(str(p), since="2025-01-01")) == []
+    assert list(iter_history_binary(str(p), until="2023-01-01")) == []
+
+
+def test_binary_keeps_exact_values(tmp_path):
+    h = History()
+    h.add(Calculation(operation="pow", a=2.0, b=2000.0, result=2 ** 2000, timestamp_utc="2024-01-01T00:00:00+00:00"))
+    h.add(Calculation(operation="pow", a=3.0, b=40.0, result=3 ** 40, timestamp_utc="2024-01-01T00:00:01.5+00:00"))
+    h.add(Calculation(operation="mul", a=1e300, b=1e300, result=Decimal("1E+600"), timestamp_utc="2024-01-01T00:00:01Z"))
+    h.add(Calculation(operation="add", a=0.1, b=0.2, result=Decimal("0.3"), timestamp_utc="2024-01-01T00:00:02.250000+00:00"))
+    h.add_many("not a time", [1.0], [1.0], "x" * 3, ["n/a"])
+    h.add(Calculation(operation="add", a=1.0, b=2.0, result=3, timestamp_utc="2024-01-01T00:00:03.000001+00:00"))
+    h.add(Calculation(operation="div", a=5.0, b=2.0, result=2.5, timestamp_utc="2024-01-01T00:00:04.000001+00:00"))
+    p = tmp_path / "h.chb"
+    h.to_binary(str(p))
+    back = History()
+    back.from_binary(str(p))
+    df = back.df
+    assert df["result"].tolist() == [2 ** 2000, 3 ** 40, Decimal("1E+600"), Decimal("0.3"), "n/a", 3, 2.5]
+    assert type(df["result"].iloc[1]) is int
+    assert df["timestamp_utc"].tolist() == h.df["timestamp_utc"].tolist()
+    assert [b.ts_min is None for b in read_index(str(p))] == [False]
+
+    # filters and verify still see float64 stand-ins
+    frames = list(iter_history_binary(str(p), operations=["pow"]))
+    assert pd.concat(frames)["result"].tolist() == [2 ** 2000, 3 ** 40]
+
+
+def test_binary_exact_int_columns(tmp_path):
+    df = pd.DataFrame(
+        {"timestamp_utc": [""] * 2, "a": [2 ** 60 + 1, 7], "b": [1, 2], "operation": ["add"] * 2, "result": [0.5, None]}
+    )
+    h = History()
+    h.restore(df)
+    p = tmp_path / "h.chb"
+    h.to_binary(str(p))
+    back = History()
+    back.from_binary(str(p))
+    assert back.df["a"].tolist() == [2 ** 60 + 1, 7.0]
+    assert back.df["timestamp_utc"].tolist() == ["", ""]
+    assert back.df["result"].iloc[0] == 0.5
+
+
+def test_binary_all_bad_timestamps_and_wide_dictionary(tmp_path):
+    h = History()
+    ops = [f"op{i}" for i in range(300)]
+    h.add_many("bad", [1.0] * 300, [2.0] * 300, "add", [3.0] * 300)
+    h.restore(h.df.assign(operation=ops))
+    p = tmp_path / "h.chb"
+    h.to_binary(str(p))
+    (block,) = read_index(str(p))
+    assert block.ts_min is None and block.ts_max is None
+    back = History()
+    back.from_binary(str(p))
+    assert back.df["operation"].tolist() == ops
+    assert list(iter_history_binary(str(p), since="2024-01-01")) == []
+    assert list(iter_history_binary(str(p), until="2024-01-01")) == []
+
+
+def test_binary_empty_history(make_history, tmp_path):
+    p = tmp_path / "h.chb"
+    assert History().to_binary(str(p)) == 0
+    back = make_history(2, op=OPS)
+    back.from_binary(str(p))
+    assert len(back) == 0
+    assert list(back.df.columns) == History.COLUMNS
+
+
+def test_binary_load_with_budget_spills(make_history, tmp_path):
+    p = tmp_path / "h.chb"
+    write_history_binary(str(p), make_history(60, op=OPS).iter_chunks(), block_rows=10)
+    h = History(memory_budget=4_000, spill_dir=str(tmp_path))
+    h.from_binary(str(p))
+    assert len(h) == 60
+    assert h.spilled
+    assert h.df["a"].tolist()[-1] == 59.0
+
+
+def test_save_and_load_dispatch(make_history, tmp_path):
+    h = make_history(3, op=OPS)
+    chb, csv = tmp_path / "h.chb", tmp_path / "h.csv"
+    h.save(str(chb))
+    h.save(str(csv))
+    assert is_history_binary(str(chb)) and not is_history_binary(str(csv))
+    for path in (chb, csv):
+        back = History()
+        back.load(str(path))
+        assert back.df["a"].tolist() == [0.0, 1.0, 2.0]
+    assert not is_history_binary(str(tmp_path / "missing.chb"))
+
+
+def test_binary_errors(make_history, tmp_path):
+    with pytest.raises(HistoryError):
+        History().to_binary(str(tmp_path / "no" / "h.chb"))
+
+    csv = tmp_path / "h.csv"
+    make_history(1, op=OPS).to_csv(str(csv))
+    with pytest.raises(HistoryError, match="Not a binary"):
+        read_index(str(csv))
+
+    p = tmp_path / "h.chb"
+    make_history(3, op=OPS).to_binary(str(p))
+    data = p.read_bytes()
+    p.write_bytes(data[:-4])
+    with pytest.raises(HistoryError, match="Truncated"):
+        History().from_binary(str(p))
+
+    with pytest.raises(HistoryError, match="Failed to load"):
+        read_index(str(tmp_path / "missing.chb"))
+
+    # intact index, corrupt block payload
+    good = tmp_path / "h2.chb"
+    make_history(3, op=OPS).to_binary(str(good))
+    raw = bytearray(good.read_bytes())
+    raw[len(history_codec.MAGIC) + 2] ^= 0xFF
+    good.write_bytes(bytes(raw))
+    with pytest.raises(HistoryError, match="Failed to load"):
+        History().from_binary(str(good))
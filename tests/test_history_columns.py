@@ -0,0 +1,29 @@
+import math
+from decimal import Decimal
+
+import pandas as pd
+
+from app.history_columns import NAT_US, float_values, format_timestamps, timestamps_us, to_float
+
+
+def test_to_float():
+    assert to_float(Decimal("0.5")) == 0.5
+    assert to_float(2 ** 2000) == math.inf
+    assert to_float(-(2 ** 2000)) == -math.inf
+    assert math.isnan(to_float("n/a"))
+    assert math.isnan(to_float(None))
+
+
+def test_float_values():
+    fast = float_values(pd.Series([1.0, 2.5], dtype=object))
+    assert fast.dtype.str == "<f8" and fast.tolist() == [1.0, 2.5]
+    slow = float_values(pd.Series([2 ** 2000, Decimal("0.25"), "x"], dtype=object))
+    assert slow[:2].tolist() == [math.inf, 0.25] and math.isnan(slow[2])
+
+
+def test_timestamps_roundtrip():
+    col = pd.Series(["2024-01-01T00:00:00.250000+00:00", "bad", "2024-01-01T01:00:00+01:00"], dtype=object)
+    us = timestamps_us(col)
+    assert us[1] == NAT_US
+    assert us[2] - us[0] == -250_000
+    assert format_timestamps(us).tolist() == ["2024-01-01T00:00:00.250000+00:00", "", "2024-01-01T00:00:00.000000+00:00"]
@@ -0,0 +1,95 @@
+import bz2
+import gzip
+import json
+import lzma
+from decimal import Decimal
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import HistoryError
+from app.history import History
+from app.history_export import export_history, infer_format
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("h.jsonl", ("jsonl", "none")),
+        ("h.ndjson.gz", ("jsonl", "gzip")),
+        ("h.csv.bz2", ("csv", "bz2")),
+        ("h.arrow.xz", ("arrow", "xz")),
+        ("h.out", ("jsonl", "none")),
+    ],
+)
+def test_infer_format(path, expected):
+    assert infer_format(path) == expected
+
+
+@pytest.mark.parametrize("compression,opener", [("none", open), ("gzip", gzip.open), ("bz2", bz2.open), ("xz", lzma.open)])
+def test_export_jsonl_in_chunks(make_history, tmp_path, compression, opener):
+    p = tmp_path / "h.jsonl"
+    summary = export_history(make_history(5), str(p), compression=compression, chunksize=2)
+    assert (summary.rows, summary.chunks) == (5, 3)
+    with opener(p, "rt") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["a"] for r in records] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert records[0]["operation"] == "mul"
+
+
+def test_export_csv_matches_to_csv(make_history, tmp_path):
+    h = make_history(7)
+    p = tmp_path / "h.csv.gz"
+    summary = export_history(h, str(p), chunksize=3)
+    assert (summary.fmt, summary.compression) == ("csv", "gzip")
+    back = pd.read_csv(p)
+    assert len(back) == 7
+    assert back.equals(pd.read_csv(pd.io.common.StringIO(h.df.to_csv(index=False))))
+
+
+def test_export_arrow_stream(make_history, tmp_path):
+    h = make_history(4)
+    ts = "2024-01-01T00:00:00+00:00"
+    h.add(Calculation(a=2.0, b=2000.0, operation="pow", result=2 ** 2000, timestamp_utc=ts))
+    h.add(Calculation(a=0.1, b=0.2, operation="add", result=Decimal("0.3"), timestamp_utc=ts))
+    h.add(Calculation(a="x", b=1.0, operation="add", result=1.0, timestamp_utc=ts))
+    p = tmp_path / "h.arrow"
+
+    summary = export_history(h, str(p), chunksize=3)
+    assert summary.rows == 7
+
+    table = pa.ipc.open_stream(pa.OSFile(str(p))).read_all()
+    assert table.num_rows == 7
+    assert table.column("operation").to_pylist()[-3:] == ["pow", "add", "add"]
+    res = table.column("result").to_pylist()
+    assert res[4] == float("inf") and res[5] == 0.3
+    assert table.column("a").to_pylist()[6] != table.column("a").to_pylist()[6]  # nan
+
+
+def test_export_walks_spilled_chunks(make_history, tmp_path):
+    h = make_history(200, memory_budget=4_000, spill_dir=str(tmp_path))
+    assert h.spilled
+    p = tmp_path / "h.jsonl"
+    assert export_history(h, str(p), chunksize=64).rows == 200
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_empty_history(tmp_path, fmt):
+    p = tmp_path / f"h.{fmt}"
+    summary = export_history(History(), str(p))
+    assert summary.rows == 0
+    if fmt == "csv":
+        assert p.read_text().strip() == ",".join(History.COLUMNS)
+
+
+@pytest.mark.parametrize("kwargs", [{"fmt": "xml"}, {"compression": "zip"}])
+def test_export_rejects_unknown_options(tmp_path, kwargs):
+    with pytest.raises(HistoryError):
+        export_history(History(), str(tmp_path / "h.jsonl"), **kwargs)
+
+
+def test_export_write_failure(make_history, tmp_path):
+    with pytest.raises(HistoryError):
+        export_history(make_history(1), str(tmp_path / "no" / "dir" / "h.jsonl"))
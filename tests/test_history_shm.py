@@ -0,0 +1,228 @@
+import multiprocessing as mp
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import history_shm
+from app.exceptions import HistoryError
+from app.history import History
+from app.history_export import export_history
+from app.history_shm import SharedHistoryPublisher, SharedHistoryReader, serve_history_file
+from app.history_verify import verify_history
+
+
+def shm_name():
+    return f"t{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def publisher():
+    pub = SharedHistoryPublisher(shm_name(), capacity=4)
+    yield pub
+    pub.close()
+
+
+def test_publish_and_read_zero_copy(make_history, publisher):
+    h = make_history(3)
+    publisher.publish(h)
+    reader = SharedHistoryReader(publisher.name)
+    try:
+        assert len(reader) == 3
+        assert reader.generation == publisher.generation
+        cols = reader.columns()
+        assert cols.a.tolist() == [0.0, 1.0, 2.0]
+        assert not cols.a.flags.writeable
+        assert np.shares_memory(reader.df["a"].to_numpy(), cols.a)
+        df = reader.df
+        assert df["timestamp_utc"].tolist() == h.df["timestamp_utc"].tolist()
+        assert df["operation"].tolist() == ["mul"] * 3
+        assert reader.query("a > 0")["result"].tolist() == [2.0, 4.0]
+        del cols, df
+    finally:
+        reader.close()
+
+
+def test_reader_sees_appends_and_segment_growth(make_history, publisher):
+    publisher.publish(make_history(2))
+    reader = SharedHistoryReader(publisher.name)
+    try:
+        old_a = reader.columns().a
+        assert not reader.refresh()
+
+        # 2 -> 7 rows outgrows capacity 4: the publisher moves to a new segment
+        publisher.append(make_history(5, start=2, op="add").df)
+        assert reader.refresh()
+        assert len(reader) == 7
+        assert reader.df["operation"].tolist() == ["mul"] * 2 + ["add"] * 5
+        # views taken before the move still read the old mapping
+        assert old_a.tolist() == [0.0, 1.0]
+
+        epoch = reader.epoch
+        publisher.publish(make_history(1, start=9))
+        assert reader.refresh()
+        assert (len(reader), reader.epoch) == (1, epoch + 1)
+        assert reader.df["a"].tolist() == [9.0]
+        del old_a
+    finally:
+        reader.close()
+
+
+def test_reader_works_with_verify_and_export(make_history, publisher, tmp_path):
+    publisher.publish(make_history(4))
+    reader = SharedHistoryReader(publisher.name)
+    try:
+        assert verify_history(reader).ok
+        summary = export_history(reader, str(tmp_path / "h.csv"))
+        assert summary.rows == 4
+    finally:
+        reader.close()
+
+
+def test_empty_publication(publisher):
+    publisher.append(pd.DataFrame(columns=History.COLUMNS))
+    reader = SharedHistoryReader(publisher.name)
+    try:
+        assert len(reader) == 0
+        assert list(reader.df.columns) == History.COLUMNS
+    finally:
+        reader.close()
+
+
+def _child_read(name, queue):
+    reader = SharedHistoryReader(name)
+    queue.put((len(reader), float(reader.columns().result.sum())))
+    reader.close()
+
+
+def test_reader_in_another_process(make_history, publisher):
+    publisher.publish(make_history(10))
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child_read, args=(publisher.name, queue))
+    proc.start()
+    assert queue.get(timeout=30) == (10, 90.0)
+    proc.join(timeout=30)
+    # the child's exit must not unlink the publisher's segments
+    reader = SharedHistoryReader(publisher.name)
+    assert len(reader) == 10
+    reader.close()
+
+
+def test_publisher_errors(publisher):
+    with pytest.raises(HistoryError, match="already published"):
+        SharedHistoryPublisher(publisher.name)
+    with pytest.raises(HistoryError, match="too long"):
+        SharedHistoryPublisher("x" * 40)
+    with pytest.raises(HistoryError, match="dictionary"):
+        publisher.append(pd.DataFrame({"timestamp_utc": "t", "a": 1.0, "b": 1.0, "operation": "x" * 20_000, "result": 1.0}, index=[0]))
+    assert publisher.generation % 2 == 0
+
+
+def test_reader_unregisters_foreign_segments(publisher, monkeypatch):
+    unregistered = []
+    monkeypatch.setattr(history_shm, "_OWNED", set())
+    monkeypatch.setattr(history_shm.resource_tracker, "unregister", lambda name, rtype: unregistered.append(rtype))
+    reader = SharedHistoryReader(publisher.name)
+    reader.close()
+    assert unregistered == ["shared_memory", "shared_memory"]
+
+
+def test_reader_errors(publisher, monkeypatch):
+    with pytest.raises(HistoryError, match="No shared history"):
+        SharedHistoryReader(shm_name())
+
+    reader = SharedHistoryReader(publisher.name, retries=3)
+    try:
+        publisher._begin()
+        with pytest.raises(HistoryError, match="busy"):
+            reader.refresh()
+        publisher._commit()
+        assert reader.refresh()
+
+        publisher._control.buf[:8] = b"XXXXXXXX"
+        with pytest.raises(HistoryError, match="not a calculator history"):
+            reader.refresh()
+        publisher._write_header()
+    finally:
+        reader.close()
+
+
+def test_reader_header_changed_during_read(publisher, monkeypatch):
+    reader = SharedHistoryReader(publisher.name)
+    real = history_shm.struct.unpack_from
+    calls = []
+
+    def racing(fmt, buf, offset=0):
+        # the publisher commits between the header and the re-check
+        calls.append(fmt)
+        if len(calls) == 1:
+            return (publisher.generation + 2,)
+        return real(fmt, buf, offset)
+
+    monkeypatch.setattr(history_shm.struct, "unpack_from", racing)
+    try:
+        reader.refresh()
+        assert len(calls) == 2
+    finally:
+        monkeypatch.undo()
+        reader.close()
+
+
+def test_reader_close_with_live_views(make_history, publisher):
+    publisher.publish(make_history(2))
+    reader = SharedHistoryReader(publisher.name)
+    cols = reader.columns()
+    reader.close()  # BufferError is swallowed while views exist
+    assert cols.a.tolist() == [0.0, 1.0]
+
+
+def test_serve_history_file(make_history, tmp_path, publisher):
+    path = tmp_path / "h.csv"
+    states = []
+
+    class Stepper:
+        """Stands in for threading.Event: each wait() rewrites the file once."""
+        steps = [lambda: make_history(3).to_csv(str(path)),
+                 lambda: make_history(5).to_csv(str(path)),
+                 lambda: make_history(2, start=7).to_csv(str(path)),
+                 # undo + new calculation: same length, different last row
+                 lambda: rewrite(make_history(1, start=7), 40),
+                 # grew, but the published rows changed underneath
+                 lambda: rewrite(make_history(1, start=9), 50, 51),
+                 lambda: rewrite(make_history(1, start=9), 50, 51, 52)]
+
+        def __init__(self):
+            self.done = False
+
+        def is_set(self):
+            return self.done
+
+        def wait(self, interval):
+            states.append((publisher.rows, publisher.generation))
+            if self.steps:
+                self.steps.pop(0)()
+            else:
+                self.done = True
+
+    def rewrite(h, *values):
+        for v in values:
+            h.add_many(f"2024-01-01T00:01:{v % 60:02d}+00:00", [float(v)], [2.0], "add", [v + 2.0])
+        h.to_csv(str(path))
+
+    reader = SharedHistoryReader(publisher.name)
+    serve_history_file(str(path), publisher, Stepper(), interval=0)
+    # no file yet, publish 3, append 2, republish the shrunken file, republish
+    # the rewritten tail twice, then append to the last one
+    assert [rows for rows, _ in states] == [0, 3, 5, 2, 2, 3, 4]
+    reader.refresh()
+    assert reader.df["a"].tolist() == [9.0, 50.0, 51.0, 52.0]
+    assert reader.epoch == 4
+    reader.close()
+
+    # a real Event stops the loop immediately
+    stopped = threading.Event()
+    stopped.set()
+    serve_history_file(str(path), publisher, stopped)
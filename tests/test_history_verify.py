@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import HistoryError
+from app.history import History
+from app.history_verify import TolerancePolicy, verify_file, verify_frames, verify_history
+
+
+def test_tolerance_policy():
+    policy = TolerancePolicy(rel_tol=1e-6, abs_tol=1e-3)
+    stored = np.array([1.0, 1.0 + 1e-7, 0.0005, 2.0, np.nan, np.inf, np.inf, 1.0])
+    expected = np.array([1.0, 1.0, 0.0, 2.1, np.nan, np.inf, -np.inf, np.nan])
+    assert policy.matches(stored, expected).tolist() == [True, True, True, False, True, True, False, False]
+    with pytest.raises(HistoryError):
+        TolerancePolicy(rel_tol=-1)
+
+
+def test_verify_groups_by_operation(make_history):
+    h = make_history(
+        rows=[
+            ("add", 1.0, 2.0, 3.0),
+            ("div", 1.0, 3.0, 1 / 3),
+            ("root", -27.0, 3.0, -3.0),
+            ("pow", 2.0, 3.0, 9.0),
+            ("dataset:mul", 10.0, 0.0, 10.0),
+        ]
+    )
+    report = verify_history(h)
+    assert report.rows == 5
+    assert report.checked == {"add": 1, "div": 1, "root": 1, "pow": 1}
+    assert report.skipped == {"dataset:mul": 1}
+    assert not report.ok
+    assert report.mismatch_counts == {"pow": 1}
+    (m,) = report.mismatches
+    assert (m.row, m.operation, m.stored, m.expected) == (3, "pow", 9.0, 8.0)
+    text = report.summary()
+    assert "pow: 1 checked, 1 mismatches" in text
+    assert "skipped (not a binary operation): dataset:mul=1" in text
+
+
+def test_verify_exact_and_decimal_results():
+    h = History()
+    h.add(Calculation(a=2.0, b=2000.0, operation="pow", result=2 ** 2000, timestamp_utc="t"))
+    h.add(Calculation(a=0.1, b=0.2, operation="add", result=Decimal("0.3"), timestamp_utc="t"))
+    assert verify_history(h).ok
+
+
+def test_verify_caps_reported_mismatches_across_frames():
+    frames = [
+        pd.DataFrame({"timestamp_utc": "t", "a": [1.0] * 3, "b": [1.0] * 3, "operation": "add", "result": [0.0] * 3}),
+        pd.DataFrame(columns=History.COLUMNS),
+        pd.DataFrame({"timestamp_utc": "t", "a": [1.0] * 3, "b": [1.0] * 3, "operation": "sub", "result": [9.0] * 3}),
+    ]
+    report = verify_frames(frames, max_reported=4)
+    assert report.rows == 6
+    assert report.mismatch_count == 6
+    assert [m.row for m in report.mismatches] == [0, 1, 2, 3]
+    assert report.summary().endswith("... 2 more mismatches")
+
+
+def test_verify_spilled_history(make_history, tmp_path):
+    h = make_history(100, memory_budget=4_000, spill_dir=str(tmp_path))
+    assert h.spilled
+    report = verify_history(h)
+    assert (report.rows, report.checked, report.ok) == (100, {"mul": 100}, True)
+
+
+@pytest.mark.parametrize("name", ["h.csv", "h.chb"])
+def test_verify_file(make_history, tmp_path, name):
+    h = make_history(rows=[("mul", 3.0, 4.0, 12.0), ("sub", 3.0, 4.0, 1.0)])
+    path = str(tmp_path / name)
+    h.save(path)
+    report = verify_file(path, TolerancePolicy(abs_tol=1.5))
+    assert report.rows == 2
+    assert report.mismatch_counts == {"sub": 1}
+
+
+def test_verify_file_errors(tmp_path):
+    with pytest.raises(HistoryError):
+        verify_file(str(tmp_path / "missing.csv"))
+    bad = tmp_path / "bad.csv"
+    pd.DataFrame({"x": [1]}).to_csv(bad, index=False)
+    with pytest.raises(HistoryError):
+        verify_file(str(bad))
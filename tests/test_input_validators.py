@@ -28,9 +28,39 @@ def test_normalize_command_none():
     with pytest.raises(InvalidInputError):
         normalize_command(None)  # type: ignore[arg-type]
 
-@pytest.mark.parametrize("cmd", ["help", "history", "exit", "clear", "undo", "redo", "save", "load"])
+@pytest.mark.parametrize("cmd", ["help", "history", "exit", "clear", "undo", "redo", "save", "load", "checkpoint", "resume", "precision"])
 def test_is_command(cmd):
     assert is_command(cmd) is True
 
 def test_is_command_false():
-    assert is_command("add 1 2") is False
\ No newline at end of file
+    assert is_command("add 1 2") is False
+
+def test_split_operands_keeps_vectors_and_ranges():
+    from app.input_validators import split_operands
+
+    assert split_operands("[1, 2, 3] range(1, 5) 2.5") == ["[1, 2, 3]", "range(1, 5)", "2.5"]
+
+
+@pytest.mark.parametrize(
+    "token,expected",
+    [
+        ("2.5", 2.5),
+        ("[1,2,3]", [1.0, 2.0, 3.0]),
+        ("[ 1.5 , -2 ]", [1.5, -2.0]),
+        ("range(3)", [0.0, 1.0, 2.0]),
+        ("range(1,1e1,4)", [1.0, 5.0, 9.0]),
+    ],
+)
+def test_parse_operand_ok(token, expected):
+    from app.input_validators import parse_operand
+
+    res = parse_operand(token)
+    assert (res.tolist() if hasattr(res, "tolist") else res) == expected
+
+
+@pytest.mark.parametrize("token", ["[]", "[1,x]", "range()", "range(1,2,3,4)", "range(5,1)", "abc"])
+def test_parse_operand_invalid(token):
+    from app.input_validators import parse_operand
+
+    with pytest.raises(InvalidInputError):
+        parse_operand(token)
@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.kernels import (
+    EXACT_POW_MAX_BITS,
+    exact_pow,
+    iroot,
+    modpow,
+    modpow_array,
+    real_root,
+    root_array,
+)
+
+
+@pytest.mark.parametrize("n,k", [(0, 3), (1, 5), (26, 3), (27, 3), (10 ** 40, 2), (3 ** 100 + 1, 5), (7, 1), (2 ** 60, 61)])
+def test_iroot_is_floor_root(n, k):
+    r = iroot(n, k)
+    assert r ** k <= n < (r + 1) ** k
+
+
+@pytest.mark.parametrize("n,k", [(-1, 2), (4, 0)])
+def test_iroot_invalid(n, k):
+    with pytest.raises(ValueError):
+        iroot(n, k)
+
+
+def test_modpow_scalar():
+    assert modpow(4, 13, 497) == 445
+    assert modpow(5, 0, 1) == 0
+    with pytest.raises(ValueError):
+        modpow(2, -1, 5)
+
+
+def test_exact_pow():
+    assert exact_pow(2, 10) == 1024.0 and isinstance(exact_pow(2, 10), float)
+    assert exact_pow(3.0, 40.0) == 3 ** 40 and isinstance(exact_pow(3, 40), int)
+    assert exact_pow(-2, 61) == -(2 ** 61)
+    assert exact_pow(1, 1e300) == 1.0
+    assert exact_pow(2, 0.5) is None
+    assert exact_pow(2, -1) is None
+    assert exact_pow(3, EXACT_POW_MAX_BITS + 1) is None
+
+
+@pytest.mark.parametrize(
+    "a,n,expected",
+    [
+        (27, 3, 3.0),
+        (-27, 3, -3.0),
+        (-32, 5, -2.0),
+        (2, 2, math.sqrt(2)),
+        (-2, 3, -(2 ** (1 / 3))),
+        (16, 0.5, 256.0),
+        (2 ** 60, 60, 2 ** (60 / 60)),
+        (2.0 ** 60, 3, 2.0 ** 20),
+        (1e17, 3, 1e17 ** (1 / 3)),
+        (-0.125, 3, -0.5),
+    ],
+)
+def test_real_root(a, n, expected):
+    assert real_root(a, n) == pytest.approx(expected)
+
+
+def test_real_root_exact_for_perfect_powers():
+    # the generic path is one ulp off here
+    assert 1000 ** (1 / 3) != 10.0
+    assert real_root(1000, 3) == 10.0
+
+
+def test_iroot_huge_degree():
+    assert iroot(10 ** 300, 10 ** 12) == 1
+
+
+@pytest.mark.parametrize("a,n", [(1e20, 1e8), (1e300, 1e12), (-1e300, 1e12 + 1)])
+def test_real_root_huge_degree_uses_float_path(a, n):
+    # iroot would raise 2 to the power n - 1 here; the root is just above 1
+    assert real_root(a, n) == pytest.approx(abs(a) ** (1 / n) * (1 if a > 0 else -1))
+
+
+@pytest.mark.parametrize("a,n", [(9, 0), (-4, 2), (-8, 0.5)])
+def test_real_root_invalid(a, n):
+    with pytest.raises(ValueError):
+        real_root(a, n)
+
+
+def test_root_array_matches_scalar():
+    a = np.array([27.0, -27.0, 1000.0, 2.0, 16.0, -32.0])
+    n = np.array([3.0, 3.0, 3.0, 2.0, 0.5, 5.0])
+    out = root_array(a, n)
+    assert out.tolist() == pytest.approx([real_root(x, y) for x, y in zip(a, n)])
+    assert out[2] == 10.0
+
+
+def test_root_array_invalid_is_nan():
+    out = root_array(np.array([-4.0, 9.0, -8.0]), np.array([2.0, 0.0, 0.5]))
+    assert np.isnan(out).all()
+
+
+def test_modpow_array_matches_scalar():
+    a = np.arange(0, 50)
+    b = np.arange(100, 150)
+    m = 2 ** 32 - 5
+    assert modpow_array(a, b, m).tolist() == [pow(int(x), int(y), m) for x, y in zip(a, b)]
+    assert modpow_array(np.array([3]), np.array([0]), 1).tolist() == [0]
+
+
+@pytest.mark.parametrize("a,b,m", [([1], [1], 0), ([1], [1], 2 ** 33), ([-1], [1], 7), ([1], [-1], 7)])
+def test_modpow_array_invalid(a, b, m):
+    with pytest.raises(ValueError):
+        modpow_array(np.array(a), np.array(b), m)
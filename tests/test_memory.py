@@ -0,0 +1,89 @@
+import tracemalloc
+
+import pandas as pd
+
+from app.calculator_memento import CalculatorMemento
+from app.history import History
+from app.memory import MemoryReport, deep_sizeof, frame_bytes, measure
+
+
+class Slotted:
+    __slots__ = ("payload", "unset")
+
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class Holder:
+    def __init__(self, df):
+        self.df = df
+        self.log = print
+        self.items = {"k": ["x" * 1000, ("y" * 1000,)], "s": {1, 2}}
+        self.slotted = Slotted("z" * 1000)
+
+
+def test_frame_bytes_counts_object_cells():
+    df = pd.DataFrame({"s": ["x" * 1000] * 10}, dtype=object)
+    assert frame_bytes(df) > 10_000
+
+
+def test_deep_sizeof_follows_containers_once():
+    df = pd.DataFrame({"a": range(1000)})
+    h = Holder(df)
+    size = deep_sizeof(h)
+    assert size > frame_bytes(df) + 3_000
+    # shared objects are counted once
+    assert deep_sizeof([h, h]) < 2 * size
+    assert deep_sizeof(print) == 0
+
+
+def test_memento_nbytes_is_cached():
+    m = CalculatorMemento(history_df=pd.DataFrame({"a": ["x" * 100] * 5}, dtype=object))
+    first = m.nbytes
+    assert first == frame_bytes(m.history_df)
+    assert m.nbytes is first
+
+
+def test_measure_subsystems(tmp_path):
+    h = History(memory_budget=4_000, spill_dir=str(tmp_path))
+    for i in range(100):
+        h.add_many("2024-01-01T00:00:00+00:00", [float(i)], [2.0], "mul", [i * 2.0])
+    m = CalculatorMemento(history_df=h._df.copy())
+    report = measure(h, [m, m], [], [Holder(pd.DataFrame())])
+    assert report.subsystems["history"] == frame_bytes(h._df)
+    assert report.subsystems["undo"] == 2 * m.nbytes
+    assert report.subsystems["redo"] == 0
+    assert report.subsystems["observers"] > 3_000
+    assert report.spilled_rows == len(h) - len(h._df)
+    assert (report.undo_entries, report.redo_entries) == (2, 0)
+    assert report.total == sum(report.subsystems.values())
+    assert report.traced_current is None
+    assert "tracemalloc off" in report.summary()
+
+
+def test_measure_with_tracemalloc():
+    tracemalloc.start()
+    try:
+        keep = [bytearray(100_000)]
+        report = measure(History(), [], [], [], top_sites=3)
+    finally:
+        tracemalloc.stop()
+    assert report.traced_current >= 100_000
+    assert report.traced_peak >= report.traced_current
+    assert 0 < len(report.top_sites) <= 3
+    assert "traced" in report.summary()
+    del keep
+
+
+def test_report_summary_units():
+    report = MemoryReport(
+        subsystems={"history": 512, "undo": 5 * 1024, "redo": 3 * 1024 ** 2, "observers": 2 * 1024 ** 3},
+        undo_entries=1,
+        redo_entries=2,
+        spilled_rows=3,
+    )
+    text = report.summary()
+    assert "512 B (3 rows spilled to disk)" in text
+    assert "5.0 KiB (1 entries)" in text
+    assert "3.0 MiB (2 entries)" in text
+    assert "2.0 GiB" in text
@@ -47,4 +47,90 @@ def test_root_ok(a, b):
 def test_root_invalid(a, b):
     op = OperationFactory.create("root")
     with pytest.raises(ValueError):
-        op.execute(a, b)
\ No newline at end of file
+        op.execute(a, b)
+
+def test_execute_batch_broadcasts_scalar():
+    import numpy as np
+    from app.operations import execute_batch
+
+    batch = execute_batch(OperationFactory.create("mul"), np.array([1.0, 2.0, 3.0, 4.0]), 2.5)
+    assert batch.result.tolist() == [2.5, 5.0, 7.5, 10.0]
+    assert batch.errors == {}
+    assert batch.ok.all()
+
+
+@pytest.mark.parametrize("token", ["add", "sub", "mul", "div", "pow", "root"])
+def test_execute_array_matches_scalar(token):
+    import numpy as np
+    from app.operations import execute_batch
+
+    op = OperationFactory.create(token)
+    a = np.array([2.0, 9.0, 27.0])
+    b = np.array([3.0, 2.0, 3.0])
+    batch = execute_batch(op, a, b)
+    expected = [op.execute(x, y) for x, y in zip(a, b)]
+    assert batch.result.tolist() == pytest.approx(expected)
+
+
+def test_execute_batch_reports_domain_errors_per_element():
+    import numpy as np
+    from app.operations import execute_batch
+
+    batch = execute_batch(OperationFactory.create("div"), np.array([1.0, 2.0, 3.0]), np.array([1.0, 0.0, 3.0]))
+    assert batch.errors == {1: "Cannot divide by zero."}
+    assert batch.ok.tolist() == [True, False, True]
+    assert batch.result[0] == 1.0 and batch.result[2] == 1.0
+
+
+def test_execute_batch_root_errors():
+    import numpy as np
+    from app.operations import execute_batch
+
+    batch = execute_batch(OperationFactory.create("root"), np.array([0.5, 4.0]), np.array([0.0, 2.0]))
+    assert "Zeroth root" in batch.errors[0]
+    assert batch.result[1] == 2.0
+
+
+def test_execute_batch_non_finite_without_exception():
+    import numpy as np
+    from app.operations import execute_batch
+
+    # scalar float ** 0.5 of a negative base returns a complex number
+    batch = execute_batch(OperationFactory.create("pow"), np.array([-4.0]), np.array([0.5]))
+    assert "Non-finite" in batch.errors[0]
+
+
+def test_execute_batch_exact_big_int_error_is_short():
+    import numpy as np
+    from app.operations import execute_batch
+
+    batch = execute_batch(OperationFactory.create("pow"), np.array([2.0, 3.0]), np.array([2000.0, 2.0]))
+    assert batch.errors[0].startswith("Result exceeds float range (603 digits)")
+    assert len(batch.errors[0]) < 100
+    assert batch.result[1] == 9.0
+
+
+def test_execute_batch_shape_mismatch():
+    import numpy as np
+    from app.exceptions import InvalidInputError
+    from app.operations import execute_batch
+
+    with pytest.raises(InvalidInputError):
+        execute_batch(OperationFactory.create("add"), np.array([1.0, 2.0]), np.array([1.0, 2.0, 3.0]))
+
+
+def test_power_integer_kernel_is_exact_past_float_range():
+    op = OperationFactory.create("pow")
+    assert op.execute(3, 40) == 3 ** 40
+    assert op.execute(2, 2000) == 2 ** 2000
+    assert op.execute(2, 0.5) == pytest.approx(2 ** 0.5)
+
+
+@pytest.mark.parametrize("a,b,expected", [(-8, 3, -2.0), (-27, 3, -3.0), (1000, 3, 10.0)])
+def test_root_real_odd_roots(a, b, expected):
+    assert OperationFactory.create("root").execute(a, b) == expected
+
+
+def test_root_even_root_of_negative():
+    with pytest.raises(ValueError):
+        OperationFactory.create("root").execute(-4, 2)
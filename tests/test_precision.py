@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+import pytest
+
+from app.operations import OperationFactory
+from app.precision import AdaptiveEngine, two_product, two_sum
+
+
+def run(engine, token, a, b):
+    return engine.execute(OperationFactory.create(token), a, b)
+
+
+def test_error_free_transformations():
+    assert two_sum(0.5, 0.25) == (0.75, 0.0)
+    assert two_sum(0.1, 0.2)[1] != 0
+    assert two_product(2.5, 4.0) == (10.0, 0.0)
+    assert two_product(0.1, 3.0)[1] != 0
+
+
+@pytest.mark.parametrize(
+    "token,a,b,expected",
+    [
+        ("add", 2, 3, 5.0),
+        ("sub", 100, 99, 1.0),
+        ("mul", 2.5, 4, 10.0),
+        ("div", 1, 4, 0.25),
+        ("pow", 2, 10, 1024.0),
+        ("pow", 2, 0.5, 2 ** 0.5),
+        ("root", 27, 3, 27 ** (1 / 3)),
+        ("div", 1, float("inf"), 0.0),
+    ],
+)
+def test_fast_path_stays_float(token, a, b, expected):
+    engine = AdaptiveEngine()
+    res = run(engine, token, a, b)
+    assert isinstance(res, float) and res == expected
+    assert engine.stats.escalations == 0
+
+
+@pytest.mark.parametrize(
+    "token,a,b,expected,reason",
+    [
+        ("add", 0.1, 0.2, Decimal("0.3"), "inexact"),
+        ("sub", 1.1, 1.0, Decimal("0.1"), "cancellation"),
+        ("mul", 0.1, 3, Decimal("0.3"), "inexact"),
+        ("mul", 1e300, 1e300, Decimal("1E+600"), "overflow"),
+        ("mul", 2.0 ** 1000, 3, Decimal(repr(2.0 ** 1000)) * 3, "inexact"),
+        ("div", 1, 3, Decimal(1) / Decimal(3), "inexact"),
+        ("div", 2.0 ** 1000, 3, Decimal(repr(2.0 ** 1000)) / 3, "inexact"),
+        ("pow", 3, -40, Decimal(3) ** -40, "inexact"),
+        ("pow", 10.5, 400, Decimal("10.5") ** 400, "overflow"),
+    ],
+)
+def test_escalates_to_decimal(token, a, b, expected, reason):
+    engine = AdaptiveEngine()
+    res = run(engine, token, a, b)
+    assert isinstance(res, Decimal)
+    assert res == +expected
+    assert engine.stats.reasons == {reason: 1}
+
+
+def test_precision_is_configurable():
+    assert run(AdaptiveEngine(precision=5), "div", 2, 3) == Decimal("0.66667")
+
+
+def test_non_finite_inputs_pass_through():
+    engine = AdaptiveEngine()
+    assert run(engine, "add", float("inf"), 1) == float("inf")
+    assert engine.stats.escalations == 0
+
+
+def test_errors_and_unchecked_ops_propagate():
+    engine = AdaptiveEngine()
+    with pytest.raises(Exception):
+        run(engine, "div", 1, 0)
+    with pytest.raises(ValueError):
+        run(engine, "root", 9, 0)
+
+    class Exploding:
+        name = symbol = "custom"
+
+        def execute(self, a, b):
+            raise OverflowError("boom")
+
+    with pytest.raises(OverflowError):
+        engine.execute(Exploding(), 1, 2)
+
+
+def test_stats_summary_and_wrap():
+    engine = AdaptiveEngine()
+    assert engine.stats.escalation_rate == 0.0
+    assert engine.stats.summary() == "evaluations=0 escalations=0 (0.0%)"
+
+    op = engine.wrap(OperationFactory.create("add"))
+    assert (op.name, op.symbol) == ("add", "+")
+    op.execute(0.1, 0.2)
+    op.execute(1, 2)
+    assert engine.stats.escalation_rate == 0.5
+    assert engine.stats.summary() == "evaluations=2 escalations=1 (50.0%) [inexact=1]"
+    assert op.execute_array(1.0, 2.0) == 3.0